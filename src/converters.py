@@ -37,22 +37,18 @@ def steps_and_edges_to_nodes(steps: List[StepDTO], edges: List[EdgeDTO]) -> List
     # Build dependency map: node_key -> [list of nodes it depends on]
     dependencies: Dict[str, List[str]] = {}
     for edge in edges:
-        if edge.to_node_key not in dependencies:
-            dependencies[edge.to_node_key] = []
-        dependencies[edge.to_node_key].append(edge.from_node_key)
-
-    # Convert steps to nodes
-    nodes = []
-    for step in steps:
-        node = {
+        dependencies.setdefault(edge.to_node_key, []).append(edge.from_node_key)
+
+    # Convert steps to nodes in one pass; the list goes straight to orjson
+    return [
+        {
             "id": step.node_key,  # Worker uses 'id', Frontend uses 'node_key'
             "type": step.type,
             "params": step.params,
             "depends_on": dependencies.get(step.node_key, [])
         }
-        nodes.append(node)
-
-    return nodes
+        for step in steps
+    ]
 
 
 def nodes_to_steps_and_edges(
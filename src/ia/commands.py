@@ -6,7 +6,34 @@ Cada comando encapsula una operación específica de corrección.
 """
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
-from copy import deepcopy
+
+from .constants import OUTPUT_NODES
+
+
+def _copy_definition(definition: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copia superficial de la definición con su propia lista de pasos.
+
+    Los comandos solo reemplazan pasos o sus `args`, y copian cada paso antes
+    de modificarlo, así que no hace falta recorrer toda la estructura con
+    `deepcopy`.
+    """
+    patched = dict(definition)
+    if "steps" in patched:
+        patched["steps"] = list(patched["steps"])
+    return patched
+
+
+def _set_missing_arg(steps: List[Dict[str, Any]], step_type: str, name: str, value: Any) -> bool:
+    """Agrega `name=value` a los pasos de `step_type` que no lo tengan (copiando el paso)."""
+    changed = False
+    for i, step in enumerate(steps):
+        if step.get("type") == step_type:
+            args = step.get("args")
+            if args is None or name not in args:
+                steps[i] = {**step, "args": {**(args or {}), name: value}}
+                changed = True
+    return changed
 
 
 class FixCommand(ABC):
@@ -47,15 +74,10 @@ class AddTimeoutCommand(FixCommand):
 
     def execute(self, definition: Dict[str, Any]) -> Dict[str, Any]:
         """Agrega timeout a todos los HTTPS GET Request que no lo tengan."""
-        patched = deepcopy(definition)
-        changes_made = False
-
-        for step in patched.get("steps", []):
-            if step.get("type") == "HTTPS GET Request":
-                args = step.setdefault("args", {})
-                if "timeout" not in args:
-                    args["timeout"] = self.timeout
-                    changes_made = True
+        patched = _copy_definition(definition)
+        changes_made = _set_missing_arg(
+            patched.get("steps", []), "HTTPS GET Request", "timeout", self.timeout
+        )
 
         if changes_made:
             self._executed = True
@@ -73,10 +95,10 @@ class AddOutputNodeCommand(FixCommand):
 
     def execute(self, definition: Dict[str, Any]) -> Dict[str, Any]:
         """Agrega nodo de salida si no existe uno."""
-        patched = deepcopy(definition)
+        patched = _copy_definition(definition)
 
         has_output = any(
-            s.get("type") in ("Save to Database", "Mock Notification")
+            s.get("type") in OUTPUT_NODES
             for s in patched.get("steps", [])
         )
 
@@ -94,7 +116,7 @@ class ReorderNodesCommand(FixCommand):
 
     def execute(self, definition: Dict[str, Any]) -> Dict[str, Any]:
         """Reordena nodos para que Validate CSV File esté antes de Simple Transform."""
-        patched = deepcopy(definition)
+        patched = _copy_definition(definition)
         steps_list = patched.get("steps", [])
 
         validate_idx = -1
@@ -109,7 +131,7 @@ class ReorderNodesCommand(FixCommand):
 
         # Si validate está después de transform, reordenar
         if validate_idx != -1 and transform_idx != -1 and validate_idx > transform_idx:
-            temp_steps = deepcopy(steps_list)
+            temp_steps = list(steps_list)
             validate_step = temp_steps.pop(validate_idx)
             temp_steps.insert(transform_idx, validate_step)
             patched["steps"] = temp_steps
@@ -131,15 +153,10 @@ class SetParameterCommand(FixCommand):
 
     def execute(self, definition: Dict[str, Any]) -> Dict[str, Any]:
         """Establece el parámetro en el paso especificado."""
-        patched = deepcopy(definition)
-        changes_made = False
-
-        for step in patched.get("steps", []):
-            if step.get("type") == self.step_type:
-                args = step.setdefault("args", {})
-                if self.param_name not in args:
-                    args[self.param_name] = self.param_value
-                    changes_made = True
+        patched = _copy_definition(definition)
+        changes_made = _set_missing_arg(
+            patched.get("steps", []), self.step_type, self.param_name, self.param_value
+        )
 
         if changes_made:
             self._executed = True
@@ -155,11 +172,11 @@ class RemoveInvalidStepsCommand(FixCommand):
 
     def __init__(self, valid_types: List[str]):
         super().__init__()
-        self.valid_types = valid_types
+        self.valid_types = frozenset(valid_types)
 
     def execute(self, definition: Dict[str, Any]) -> Dict[str, Any]:
         """Remueve pasos que no tienen tipo válido."""
-        patched = deepcopy(definition)
+        patched = _copy_definition(definition)
         original_steps = patched.get("steps", [])
 
         valid_steps = [
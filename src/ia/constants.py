@@ -0,0 +1,13 @@
+# src/ia/constants.py
+"""
+Tipos de nodo compartidos por los proveedores, handlers y comandos de IA.
+
+Se definen en un solo lugar para que las rutas de sugerencia, fix y
+handlers clasifiquen los pasos de la misma forma.
+"""
+
+# Tipos de paso que cuentan como salida observable del workflow
+OUTPUT_NODES = frozenset({"Save to Database", "Mock Notification"})
+
+# Tipos de paso que hacen requests HTTP
+HTTP_NODES = frozenset({"HTTPS GET Request"})
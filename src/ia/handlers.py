@@ -6,12 +6,35 @@ Cada handler se encarga de una regla específica y puede pasar al siguiente hand
 """
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
-from copy import deepcopy
+
+from .constants import HTTP_NODES, OUTPUT_NODES
+
+
+# Tipo que debe ir después -> tipo que debe precederlo
+ORDER_BEFORE = {"Simple Transform": "Validate CSV File"}
+
+
+def _type_positions(steps: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """Índices de los pasos agrupados por tipo (una sola pasada sobre los pasos)."""
+    positions: Dict[str, List[int]] = {}
+    for i, step in enumerate(steps):
+        positions.setdefault(step.get("type"), []).append(i)
+    return positions
+
+
+def _positions_of(positions: Dict[str, List[int]], types: frozenset) -> List[int]:
+    """Índices ordenados de los pasos cuyo tipo pertenece a `types`."""
+    return sorted(i for t in types for i in positions.get(t, ()))
 
 
 class SuggestionHandler(ABC):
     """Handler base para la cadena de responsabilidad de sugerencias."""
 
+    # Los handlers de este módulo aceptan `positions` en _process para
+    # compartir el índice por tipo; las subclases que implementan
+    # _process(definition, suggestions) siguen funcionando sin cambios.
+    _uses_positions = False
+
     def __init__(self, next_handler: Optional["SuggestionHandler"] = None):
         """
         Args:
@@ -24,28 +47,49 @@ class SuggestionHandler(ABC):
         self._next_handler = handler
         return handler
 
-    def handle(self, definition: Dict[str, Any], suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def handle(
+        self,
+        definition: Dict[str, Any],
+        suggestions: List[Dict[str, Any]],
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Procesa la definición y agrega sugerencias.
 
         Args:
             definition: Definición del workflow
             suggestions: Lista de sugerencias acumuladas
+            positions: Índices de pasos por tipo (opcional); se calcula la
+                primera vez que un handler lo necesita y se comparte con los
+                siguientes handlers
 
         Returns:
             Lista de sugerencias actualizada
         """
         # Procesar en este handler
-        suggestions = self._process(definition, suggestions)
+        if self._uses_positions:
+            if positions is None:
+                positions = _type_positions(definition.get("steps", []))
+            suggestions = self._process(definition, suggestions, positions)
+        else:
+            suggestions = self._process(definition, suggestions)
 
         # Pasar al siguiente handler si existe
-        if self._next_handler:
-            return self._next_handler.handle(definition, suggestions)
-
-        return suggestions
+        next_handler = self._next_handler
+        if not next_handler:
+            return suggestions
+        # Solo se reenvía el índice a handlers que usan este handle()
+        if positions is not None and type(next_handler).handle is SuggestionHandler.handle:
+            return next_handler.handle(definition, suggestions, positions)
+        return next_handler.handle(definition, suggestions)
 
     @abstractmethod
-    def _process(self, definition: Dict[str, Any], suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process(
+        self,
+        definition: Dict[str, Any],
+        suggestions: List[Dict[str, Any]],
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Lógica específica de procesamiento del handler."""
         pass
 
@@ -53,31 +97,45 @@ class SuggestionHandler(ABC):
 class TimeoutHandler(SuggestionHandler):
     """Handler que verifica que los requests HTTP tengan timeout."""
 
-    def _process(self, definition: Dict[str, Any], suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _uses_positions = True
+
+    def _process(
+        self,
+        definition: Dict[str, Any],
+        suggestions: List[Dict[str, Any]],
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Verifica timeout en HTTPS GET Request."""
-        for idx, step in enumerate(definition.get("steps", [])):
-            if step.get("type") == "HTTPS GET Request":
-                args = step.get("args", {}) or {}
-                if "timeout" not in args:
-                    suggestions.append({
-                        "op": "add_arg",
-                        "target_step_index": idx,
-                        "arg": {"timeout": 30},
-                        "reason": "Agregar timeout para prevenir bloqueos indefinidos en requests HTTP.",
-                    })
+        if positions is None:
+            positions = _type_positions(definition.get("steps", []))
+        steps = definition.get("steps", [])
+        for idx in _positions_of(positions, HTTP_NODES):
+            args = steps[idx].get("args", {}) or {}
+            if "timeout" not in args:
+                suggestions.append({
+                    "op": "add_arg",
+                    "target_step_index": idx,
+                    "arg": {"timeout": 30},
+                    "reason": "Agregar timeout para prevenir bloqueos indefinidos en requests HTTP.",
+                })
         return suggestions
 
 
 class OutputNodeHandler(SuggestionHandler):
     """Handler que verifica la existencia de nodos de salida."""
 
-    def _process(self, definition: Dict[str, Any], suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _uses_positions = True
+
+    def _process(
+        self,
+        definition: Dict[str, Any],
+        suggestions: List[Dict[str, Any]],
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Verifica que exista al menos un nodo de salida."""
-        steps = definition.get("steps", [])
-        has_output = any(
-            s.get("type") in ("Save to Database", "Mock Notification")
-            for s in steps
-        )
+        if positions is None:
+            positions = _type_positions(definition.get("steps", []))
+        has_output = not OUTPUT_NODES.isdisjoint(positions)
 
         if not has_output:
             suggestions.append({
@@ -92,29 +150,32 @@ class OutputNodeHandler(SuggestionHandler):
 class ValidationOrderHandler(SuggestionHandler):
     """Handler que verifica el orden correcto de validación y transformación."""
 
-    def _process(self, definition: Dict[str, Any], suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _uses_positions = True
+
+    def _process(
+        self,
+        definition: Dict[str, Any],
+        suggestions: List[Dict[str, Any]],
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Verifica que Validate CSV File esté antes de Simple Transform."""
-        steps = definition.get("steps", [])
-        validate_idx = -1
-        transform_idx = -1
-
-        for i, step in enumerate(steps):
-            step_type = step.get("type")
-            if step_type == "Validate CSV File":
-                validate_idx = i
-            elif step_type == "Simple Transform":
-                transform_idx = i
-
-        # Si ambos existen y validate está después de transform
-        if validate_idx != -1 and transform_idx != -1 and validate_idx > transform_idx:
-            suggestions.append({
-                "op": "reorder",
-                "reason": "Mover 'Validate CSV File' antes de 'Simple Transform' para validar datos antes de transformarlos.",
-                "detail": {
-                    "move_step_from": validate_idx,
-                    "move_step_to": transform_idx
-                }
-            })
+        if positions is None:
+            positions = _type_positions(definition.get("steps", []))
+        for transform_type, validate_type in ORDER_BEFORE.items():
+            # Última aparición de cada tipo, igual que el recorrido secuencial original
+            validate_idx = positions.get(validate_type, [-1])[-1]
+            transform_idx = positions.get(transform_type, [-1])[-1]
+
+            # Si ambos existen y validate está después de transform
+            if validate_idx != -1 and transform_idx != -1 and validate_idx > transform_idx:
+                suggestions.append({
+                    "op": "reorder",
+                    "reason": f"Mover '{validate_type}' antes de '{transform_type}' para validar datos antes de transformarlos.",
+                    "detail": {
+                        "move_step_from": validate_idx,
+                        "move_step_to": transform_idx
+                    }
+                })
 
         return suggestions
 
@@ -122,14 +183,23 @@ class ValidationOrderHandler(SuggestionHandler):
 class PerformanceHandler(SuggestionHandler):
     """Handler que sugiere optimizaciones de rendimiento."""
 
-    def _process(self, definition: Dict[str, Any], suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    _uses_positions = True
+
+    def _process(
+        self,
+        definition: Dict[str, Any],
+        suggestions: List[Dict[str, Any]],
+        positions: Optional[Dict[str, List[int]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Analiza pasos que podrían paralelizarse o optimizarse."""
+        if positions is None:
+            positions = _type_positions(definition.get("steps", []))
         steps = definition.get("steps", [])
 
         # Detectar pasos independientes que podrían ejecutarse en paralelo
         if len(steps) >= 3:
             # Heurística simple: si hay múltiples GET requests independientes
-            get_requests = [i for i, s in enumerate(steps) if s.get("type") == "HTTPS GET Request"]
+            get_requests = _positions_of(positions, HTTP_NODES)
 
             if len(get_requests) >= 2:
                 suggestions.append({
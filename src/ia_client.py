@@ -10,14 +10,20 @@ Integra:
 """
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Dict, List, Optional, Union, cast
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+import orjson
 
 # Importar componentes de la nueva arquitectura
 from .ia.factory import IAProviderFactory
-from .ia.providers import IAProviderStrategy
+from .ia.providers import IAProviderStrategy, MockIAProvider
 from .ia.commands import FixCommandInvoker, FixCommandFactory
-from .ia.observers import WorkflowSubject, LogObserver, MetricsObserver
+from .ia.observers import WorkflowEvent, WorkflowSubject, LogObserver, MetricsObserver
 from .ia.services import RouteOptimizer, CostPredictor
 
 # --------------------------------------------------------------------------------------
@@ -28,19 +34,44 @@ from .ia.services import RouteOptimizer, CostPredictor
 # --------------------------------------------------------------------------------------
 _instance: Optional["IAClient"] = None
 
+# Máximo de respuestas memoizadas por cliente (LRU)
+_CACHE_MAXSIZE = 512
+# Vigencia de una respuesta memoizada: la salida de un LLM no es
+# determinística y una respuesta mala no debe quedar fija
+_CACHE_TTL_SECONDS = 60.0
+
+
+def _cache_key(*parts: Any) -> Optional[bytes]:
+    """Hash estable de la entrada canónica; None si no es serializable a JSON."""
+    try:
+        payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        return None
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
 
 def get_ia_client() -> "IAClient":
     """Devuelve la instancia única de IAClient (Singleton) de forma robusta para pruebas.
 
     Nota: Los tests pueden borrar el símbolo `_instance` con `delattr`.
-    Por eso consultamos/escribimos en `globals()` en lugar de depender de
-    una variable de módulo siempre presente.
+    Por eso la lectura tolera que el global no exista y, en ese caso,
+    se recrea la instancia por el camino lento.
     """
-    inst = globals().get("_instance", None)
-    if not isinstance(inst, IAClient):
-        inst = IAClient()
-        globals()["_instance"] = inst
-    return inst
+    # Camino rápido: lectura directa del global del módulo
+    try:
+        inst = _instance
+    except NameError:  # un test borró el símbolo con delattr
+        inst = None
+    if isinstance(inst, IAClient):
+        return inst
+    return _create_instance()
+
+
+def _create_instance() -> "IAClient":
+    """Crea la instancia única y la publica en el módulo (camino lento)."""
+    global _instance
+    _instance = IAClient()
+    return _instance
 
 
 
@@ -60,6 +91,17 @@ class IAClient:
     - Mantener compatibilidad con tests existentes
     """
 
+    __slots__ = (
+        "provider",
+        "subject",
+        "log_observer",
+        "metrics_observer",
+        "route_optimizer",
+        "cost_predictor",
+        "_cache",
+        "_cache_lock",
+    )
+
     # Valores fijos para mantener determinismo en los mocks.
     _DEFAULT_CONFIDENCE = 0.66
     _DEFAULT_TIMEOUT_SEC = 30
@@ -87,6 +129,12 @@ class IAClient:
         self.route_optimizer = RouteOptimizer()
         self.cost_predictor = CostPredictor()
 
+        # Respuestas memoizadas por hash de la definición:
+        # clave -> (instante de expiración, respuesta serializada con orjson)
+        self._cache: "OrderedDict[bytes, Tuple[float, bytes]]" = OrderedDict()
+        # Las variantes async ejecutan en hilos: proteger el LRU
+        self._cache_lock = threading.Lock()
+
     def suggest(self, definition: Dict[str, Any]) -> Dict[str, Any]:
         """
         Genera sugerencias para mejorar el workflow usando el proveedor configurado.
@@ -102,14 +150,18 @@ class IAClient:
             Exception: Si el proveedor falla después de todos los reintentos
         """
         # Delegar al proveedor (Strategy Pattern)
-        result = self.provider.suggest(definition)
+        result = self._memoized(
+            ("suggest", definition),
+            lambda: self.provider.suggest(definition),
+        )
 
         # Notificar a observadores
-        workflow_id = definition.get("name", "unknown")
-        self.subject.notify_suggestion(
-            workflow_id=workflow_id,
-            suggestions=result.get("suggested_changes", [])
-        )
+        suggestions = result.get("suggested_changes", [])
+        self.subject.notify(WorkflowEvent(
+            event_type="suggestion",
+            workflow_id=definition.get("name", "unknown"),
+            data={"suggestions_count": len(suggestions), "suggestions": suggestions}
+        ))
 
         return result
 
@@ -127,14 +179,18 @@ class IAClient:
             Exception: Si el proveedor falla después de todos los reintentos
         """
         # Usar el proveedor de IA
-        result = self.provider.fix(definition, logs)
+        result = self._memoized(
+            ("fix", definition, logs),
+            lambda: self.provider.fix(definition, logs),
+        )
 
         # Notificar a observadores
-        workflow_id = definition.get("name", "unknown")
-        self.subject.notify_fix(
-            workflow_id=workflow_id,
-            changes=result.get("notes", [])
-        )
+        changes = result.get("notes", [])
+        self.subject.notify(WorkflowEvent(
+            event_type="fix",
+            workflow_id=definition.get("name", "unknown"),
+            data={"changes_count": len(changes), "changes": changes}
+        ))
 
         return result
 
@@ -156,15 +212,72 @@ class IAClient:
             Exception: Si el proveedor falla después de todos los reintentos
         """
         # Usar el proveedor de IA
-        result = self.provider.estimate(definition)
+        result = self._memoized(
+            ("estimate", definition),
+            lambda: self.provider.estimate(definition),
+        )
 
         # Notificar a observadores
-        workflow_id = definition.get("name", "unknown")
-        self.subject.notify_estimate(
-            workflow_id=workflow_id,
-            estimate_data=result
-        )
+        self.subject.notify(WorkflowEvent(
+            event_type="estimate",
+            workflow_id=definition.get("name", "unknown"),
+            data=result
+        ))
+
+        return result
+
+    # Variantes async: los proveedores reales (Gemini/OpenAI) usan SDKs
+    # bloqueantes, así que se ejecutan en un hilo para no bloquear el event loop.
+
+    async def asuggest(self, definition: Dict[str, Any]) -> Dict[str, Any]:
+        """Versión async de `suggest`."""
+        return await asyncio.to_thread(self.suggest, definition)
 
+    async def afix(self, definition: Dict[str, Any], logs: Union[str, List[str], None]) -> Dict[str, Any]:
+        """Versión async de `fix`."""
+        return await asyncio.to_thread(self.fix, definition, logs)
+
+    async def aestimate(self, definition: Dict[str, Any]) -> Dict[str, Any]:
+        """Versión async de `estimate`."""
+        return await asyncio.to_thread(self.estimate, definition)
+
+    def _memoized(self, parts: Tuple[Any, ...], compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Devuelve la respuesta cacheada para la entrada `parts` o la calcula y la guarda.
+
+        El proveedor mock es determinístico y más rápido que el hash y la
+        (de)serialización, así que no se memoiza. Para los proveedores reales
+        cada respuesta vale `_CACHE_TTL_SECONDS`. Se guardan bytes de orjson
+        para que cada llamada reciba una copia independiente del resultado.
+        """
+        if isinstance(self.provider, MockIAProvider):
+            return compute()
+
+        key = _cache_key(*parts)
+        if key is not None:
+            now = time.monotonic()
+            with self._cache_lock:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        self._cache.move_to_end(key)
+                    else:
+                        del self._cache[key]
+                        entry = None
+            if entry is not None:
+                return orjson.loads(entry[1])
+
+        result = compute()
+
+        if key is not None:
+            try:
+                encoded = orjson.dumps(result)
+            except orjson.JSONEncodeError:
+                return result
+            with self._cache_lock:
+                self._cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, encoded)
+                if len(self._cache) > _CACHE_MAXSIZE:
+                    self._cache.popitem(last=False)
         return result
 
     def get_metrics(self) -> Dict[str, Any]:
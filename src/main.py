@@ -6,14 +6,28 @@ Connects Frontend (Steps+Edges format) with Worker (Nodes+depends_on format)
 from dotenv import load_dotenv
 load_dotenv()
 
+import functools
+import hashlib
+import hmac
 import os
+import re
+import secrets
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, UTC
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Depends, Security, UploadFile, File
+import orjson
+
+from fastapi import FastAPI, HTTPException, Depends, Security, UploadFile, File, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from pydantic import BaseModel
 from sqlmodel import create_engine
 
 # Import our models
@@ -35,6 +49,8 @@ from .models import (
     RunDetailDTO,
     LogEntry,
     GetLogsOptions,
+    RUN_LIST_ADAPTER,
+    LOG_LIST_ADAPTER,
     # IA models
     IASuggestionRequest,
     IASuggestionResponse,
@@ -44,7 +60,7 @@ from .models import (
     IAFixChangeItem,
     IAEstimateRequest,
     IAEstimateResponse,
-    IAEstimateBreakdownItem,
+    ESTIMATE_BREAKDOWN_ADAPTER,
 )
 
 from .repository import WorkflowRepository
@@ -55,7 +71,19 @@ from . import ia_client
 # App Configuration
 # ============================================================================
 
+_ia: Optional[ia_client.IAClient] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bind the IA client singleton once at startup."""
+    global _ia
+    _ia = ia_client.get_ia_client()
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Workflow Orchestration API",
     version="1.0.0",
     description="Integrated Backend API for Frontend and Worker communication"
@@ -89,13 +117,43 @@ DATABASE_URL = f"sqlite:///{DB_PATH}"
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=16,
+    max_overflow=32,
     echo=False  # Set to True for SQL debugging
 )
 
+# Per-connection SQLite tuning: WAL lets the Worker read while the API writes
+_SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-64000",
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
 # Initialize repository
 repo = WorkflowRepository(engine)
 repo.create_schema()
 
+
+async def get_repo() -> WorkflowRepository:
+    """
+    Repository dependency.
+    Tests swap it through app.dependency_overrides instead of patching globals.
+    Declared async so FastAPI resolves it inline instead of in the threadpool.
+    """
+    return repo
+
+
 print(f"[Backend] Using shared database: {DB_PATH}")
 
 
@@ -103,42 +161,54 @@ print(f"[Backend] Using shared database: {DB_PATH}")
 # Authentication
 # ============================================================================
 
+_MOCK_PREFIX = "mock-"
+_MOCK_PREFIX_LEN = len(_MOCK_PREFIX)
+
+
 async def validate_token(
     credentials: Optional[HTTPAuthorizationCredentials] = Security(security)
 ) -> str:
     """
     Validate bearer token.
     For demo: accepts tokens starting with 'mock-'
-    """
-    if not credentials:
-        raise HTTPException(status_code=401, detail="Unauthorized")
 
-    token = credentials.credentials
-
-    if not token.startswith("mock-"):
+    Kept as ``async def`` on purpose: it never blocks, and FastAPI would
+    dispatch a sync dependency to the threadpool on every request.
+    """
+    # HTTPBearer has already split off the "Bearer " scheme. A prefix slice
+    # also rejects empty tokens, so one test covers every failure case.
+    if credentials is None or credentials.credentials[:_MOCK_PREFIX_LEN] != _MOCK_PREFIX:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    return token
+    return credentials.credentials
 
 
 # ============================================================================
 # Authentication Endpoints
 # ============================================================================
 
+# Mock credentials (bytes for constant-time comparison) and the user they map to
+_DEMO_USERNAME = b"demo"
+_DEMO_PASSWORD = b"demo123"
+_DEMO_USER = UserInfo.model_construct(id=str(uuid4()), name="Demo User")
+
+
 @app.post("/login", response_model=LoginResponse, tags=["auth"])
 def login(payload: LoginRequest) -> LoginResponse:
     """
     Mock authentication endpoint.
     Accepts username='demo', password='demo123'
     """
-    if not (payload.username == "demo" and payload.password == "demo123"):
+    # Both digests are always computed (no short-circuit on the username)
+    valid = hmac.compare_digest(payload.username.encode(), _DEMO_USERNAME)
+    valid &= hmac.compare_digest(payload.password.encode(), _DEMO_PASSWORD)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    user_id = str(uuid4())
-    return LoginResponse(
-        access_token=f"mock-{uuid4().hex[:12]}",
+    return LoginResponse.model_construct(
+        access_token=_MOCK_PREFIX + secrets.token_urlsafe(9),
         token_type="bearer",
-        user=UserInfo(id=user_id, name="Demo User"),
+        user=_DEMO_USER,
     )
 
 
@@ -146,80 +216,86 @@ def login(payload: LoginRequest) -> LoginResponse:
 # Task Types Endpoints
 # ============================================================================
 
-@app.get("/task-types", response_model=List[TaskType], tags=["task-types"])
-async def get_task_types(token: str = Depends(validate_token)) -> List[TaskType]:
-    """
-    Get catalog of available task types.
-    These correspond to the strategies implemented in the Worker.
-    """
-    task_types = [
-        TaskType(
-            type="http_get",
-            display_name="Petición HTTP GET",
-            version="1.0.0",
-            params_schema={
-                "type": "object",
-                "properties": {
-                    "url": {"type": "string"},
-                    "headers": {"type": "object"},
-                },
-                "required": ["url"],
+# Catalog of task types supported by the Worker (static)
+TASK_TYPES: List[TaskType] = [
+    TaskType(
+        type="http_get",
+        display_name="Petición HTTP GET",
+        version="1.0.0",
+        params_schema={
+            "type": "object",
+            "properties": {
+                "url": {"type": "string"},
+                "headers": {"type": "object"},
             },
-        ),
-        TaskType(
-            type="validate_csv",
-            display_name="Validar Archivo CSV",
-            version="1.0.0",
-            params_schema={
-                "type": "object",
-                "properties": {
-                    "file_path": {"type": "string"},
-                    "columns": {"type": "array"},
-                    "delimiter": {"type": "string"},
-                },
-                "required": ["file_path", "columns"],
+            "required": ["url"],
+        },
+    ),
+    TaskType(
+        type="validate_csv",
+        display_name="Validar Archivo CSV",
+        version="1.0.0",
+        params_schema={
+            "type": "object",
+            "properties": {
+                "file_path": {"type": "string"},
+                "columns": {"type": "array"},
+                "delimiter": {"type": "string"},
             },
-        ),
-        TaskType(
-            type="transform_simple",
-            display_name="Transformación Simple",
-            version="1.0.0",
-            params_schema={
-                "type": "object",
-                "properties": {
-                    "operations": {"type": "array"},
-                },
-                "required": ["operations"],
+            "required": ["file_path", "columns"],
+        },
+    ),
+    TaskType(
+        type="transform_simple",
+        display_name="Transformación Simple",
+        version="1.0.0",
+        params_schema={
+            "type": "object",
+            "properties": {
+                "operations": {"type": "array"},
             },
-        ),
-        TaskType(
-            type="save_db",
-            display_name="Guardar en Base de Datos",
-            version="1.0.0",
-            params_schema={
-                "type": "object",
-                "properties": {
-                    "table": {"type": "string"},
-                    "mode": {"type": "string", "enum": ["append", "replace"]},
-                },
-                "required": ["table"],
+            "required": ["operations"],
+        },
+    ),
+    TaskType(
+        type="save_db",
+        display_name="Guardar en Base de Datos",
+        version="1.0.0",
+        params_schema={
+            "type": "object",
+            "properties": {
+                "table": {"type": "string"},
+                "mode": {"type": "string", "enum": ["append", "replace"]},
             },
-        ),
-        TaskType(
-            type="notify_mock",
-            display_name="Notificación de Prueba",
-            version="1.0.0",
-            params_schema={
-                "type": "object",
-                "properties": {
-                    "channel": {"type": "string"},
-                    "message": {"type": "string"},
-                },
-                "required": ["channel", "message"],
+            "required": ["table"],
+        },
+    ),
+    TaskType(
+        type="notify_mock",
+        display_name="Notificación de Prueba",
+        version="1.0.0",
+        params_schema={
+            "type": "object",
+            "properties": {
+                "channel": {"type": "string"},
+                "message": {"type": "string"},
             },
-        ),
-    ]
-    return task_types
+            "required": ["channel", "message"],
+        },
+    ),
+]
+
+# Serialized once: the catalog never changes at runtime
+_TASK_TYPES_JSON: bytes = orjson.dumps([t.model_dump() for t in TASK_TYPES])
+
+
+@app.get("/task-types", response_model=List[TaskType], tags=["task-types"])
+async def get_task_types(token: str = Depends(validate_token)) -> Response:
+    """
+    Get catalog of available task types.
+    These correspond to the strategies implemented in the Worker.
+    """
+    return Response(content=_TASK_TYPES_JSON, media_type="application/json")
 
 
 # ============================================================================
@@ -229,6 +305,7 @@ async def get_task_types(token: str = Depends(validate_token)) -> List[TaskType]
 @app.post("/workflows", response_model=WorkflowDetailDTO, status_code=201, tags=["workflows"])
 async def create_workflow(
     data: CreateWorkflowDTO,
+    repo: WorkflowRepository = Depends(get_repo),
     token: str = Depends(validate_token)
 ) -> WorkflowDetailDTO:
     """
@@ -239,13 +316,51 @@ async def create_workflow(
 
 
 @app.get("/workflows", response_model=List[WorkflowListItem], tags=["workflows"])
-async def list_workflows(token: str = Depends(validate_token)) -> List[WorkflowListItem]:
-    """Get list of all workflows"""
-    return repo.list_workflows()
+async def list_workflows(
+    request: Request,
+    repo: WorkflowRepository = Depends(get_repo),
+    token: str = Depends(validate_token)
+) -> Response:
+    """
+    Get list of all workflows.
+    The repository caches the serialized list; its ETag tracks the table
+    state, so a matching If-None-Match gets a 304 without a body.
+    """
+    etag, body = repo.list_workflows_json()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/workflows/stream", response_model=List[WorkflowListItem], tags=["workflows"])
+async def stream_workflows(
+    repo: WorkflowRepository = Depends(get_repo),
+    token: str = Depends(validate_token)
+) -> StreamingResponse:
+    """
+    Stream the workflow list as a JSON array.
+
+    Rows are encoded as they come off the cursor, so memory stays bounded by
+    the fetch batch instead of the table size. The sync generator is iterated
+    in the threadpool by StreamingResponse.
+    """
+    def body() -> Iterator[bytes]:
+        yield b"["
+        sep = b""
+        for item in repo.iter_workflows():
+            yield sep + orjson.dumps(item.model_dump())
+            sep = b","
+        yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @app.get("/workflows/{id}", response_model=WorkflowDetailDTO, tags=["workflows"])
-async def get_workflow(id: str, token: str = Depends(validate_token)) -> WorkflowDetailDTO:
+async def get_workflow(
+    id: str,
+    repo: WorkflowRepository = Depends(get_repo),
+    token: str = Depends(validate_token)
+) -> WorkflowDetailDTO:
     """Get workflow by ID with steps and edges"""
     workflow = repo.get_workflow(id)
     if not workflow:
@@ -257,6 +372,7 @@ async def get_workflow(id: str, token: str = Depends(validate_token)) -> Workflo
 async def update_workflow(
     id: str,
     data: UpdateWorkflowDTO,
+    repo: WorkflowRepository = Depends(get_repo),
     token: str = Depends(validate_token)
 ) -> WorkflowDetailDTO:
     """Update workflow"""
@@ -267,7 +383,11 @@ async def update_workflow(
 
 
 @app.delete("/workflows/{id}", status_code=204, tags=["workflows"])
-async def delete_workflow(id: str, token: str = Depends(validate_token)):
+async def delete_workflow(
+    id: str,
+    repo: WorkflowRepository = Depends(get_repo),
+    token: str = Depends(validate_token)
+):
     """Delete workflow"""
     success = repo.delete_workflow(id)
     if not success:
@@ -280,7 +400,11 @@ async def delete_workflow(id: str, token: str = Depends(validate_token)):
 # ============================================================================
 
 @app.post("/workflows/{id}/runs", response_model=Run, tags=["runs"])
-async def trigger_workflow(id: str, token: str = Depends(validate_token)) -> Run:
+async def trigger_workflow(
+    id: str,
+    repo: WorkflowRepository = Depends(get_repo),
+    token: str = Depends(validate_token)
+) -> Run:
     """
     Trigger workflow execution.
     Sets workflow status to 'en_espera' so Worker picks it up.
@@ -294,14 +418,22 @@ async def trigger_workflow(id: str, token: str = Depends(validate_token)) -> Run
 @app.get("/workflows/{workflow_id}/runs", response_model=List[Run], tags=["runs"])
 async def get_workflow_runs(
     workflow_id: str,
+    repo: WorkflowRepository = Depends(get_repo),
     token: str = Depends(validate_token)
-) -> List[Run]:
+) -> Response:
     """Get execution history for a workflow"""
-    return repo.get_workflow_runs(workflow_id)
+    return Response(
+        content=RUN_LIST_ADAPTER.dump_json(repo.get_workflow_runs(workflow_id)),
+        media_type="application/json",
+    )
 
 
 @app.get("/runs/{run_id}", response_model=RunDetailDTO, tags=["runs"])
-async def get_run_detail(run_id: str, token: str = Depends(validate_token)) -> RunDetailDTO:
+async def get_run_detail(
+    run_id: str,
+    repo: WorkflowRepository = Depends(get_repo),
+    token: str = Depends(validate_token)
+) -> RunDetailDTO:
     """Get run details with task instances"""
     run_detail = repo.get_run_detail(run_id)
     if not run_detail:
@@ -315,13 +447,17 @@ async def get_run_logs(
     task: Optional[str] = None,
     page: int = 1,
     limit: int = 100,
+    repo: WorkflowRepository = Depends(get_repo),
     token: str = Depends(validate_token)
-) -> List[LogEntry]:
+) -> Response:
     """
     Get logs for a run.
     Generates synthetic logs from noderun data since Worker doesn't expose structured logs yet.
     """
-    return repo.get_run_logs(run_id, task)
+    return Response(
+        content=LOG_LIST_ADAPTER.dump_json(repo.get_run_logs(run_id, task)),
+        media_type="application/json",
+    )
 
 
 @app.post("/runs/{run_id}/cancel", response_model=Run, tags=["runs"])
@@ -337,168 +473,227 @@ async def cancel_run(run_id: str, token: str = Depends(validate_token)) -> Run:
 # IA Service Endpoints
 # ============================================================================
 
+def _model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON, skipping FastAPI's second
+    validation pass against response_model.
+    Callers build the model and its items with validation (provider output
+    included). As a safety net, a value that does not match the schema
+    raises instead of being serialized with a warning.
+    """
+    return Response(content=model.model_dump_json(warnings="error"), media_type="application/json")
+
+
+async def get_ia() -> ia_client.IAClient:
+    """
+    IA client dependency.
+    Returns the instance bound at startup; falls back to the singleton getter
+    when the lifespan did not run (e.g. TestClient used without a context).
+    Declared async so FastAPI resolves it inline instead of in the threadpool.
+    """
+    return _ia if _ia is not None else ia_client.get_ia_client()
+
+
+def ia_endpoint(label: str):
+    """
+    Wrap an IA handler so any failure surfaces as a 500 with `label`.
+    Replaces the per-handler try/except blocks; functools.wraps keeps the
+    signature FastAPI inspects for dependencies.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"{label}: {e}") from e
+        return wrapper
+    return decorator
+
+
+def _arg_detail(change: dict) -> dict:
+    return {"arg_name": change.get("arg_name"), "arg_value": change.get("arg_value")}
+
+
+def _node_detail(change: dict) -> dict:
+    return {"node": change.get("node")}
+
+
+def _default_detail(change: dict) -> dict:
+    return change.get("detail", {})
+
+
+# Pre-rendered "steps[i]" paths for the common indices
+_PATHS = tuple(f"steps[{i}]" for i in range(256))
+
+
+def _step_path(idx) -> str:
+    if type(idx) is int and 0 <= idx < 256:
+        return _PATHS[idx]
+    return f"steps[{idx}]"
+
+
+# Suggestion `op` -> builder for its `detail` payload
+_DETAIL_BUILDERS = {
+    "add_arg": _arg_detail,
+    "modify_arg": _arg_detail,
+    "add_node": _node_detail,
+}
+
+
 @app.post("/ia/suggestion", response_model=IASuggestionResponse, tags=["ia"])
+@ia_endpoint("Error getting AI suggestions")
 async def ia_suggestion(
     payload: IASuggestionRequest,
     token: str = Depends(validate_token),
-) -> IASuggestionResponse:
+    client: ia_client.IAClient = Depends(get_ia),
+) -> Response:
     """
     Get AI suggestions for workflow improvement.
     Uses Gemini API for intelligent analysis.
     """
-    try:
-        client = ia_client.get_ia_client()
-        result = client.suggest(payload.definition)
-
-        suggestions_list = []
-        for change in result.get("suggested_changes", []):
-            # Construir detail basado en el tipo de operación
-            detail = {}
-            if change.get("op") == "add_arg" or change.get("op") == "modify_arg":
-                detail = {
-                    "arg_name": change.get("arg_name"),
-                    "arg_value": change.get("arg_value")
-                }
-            elif change.get("op") == "add_node":
-                detail = {"node": change.get("node")}
-            elif change.get("op") == "reorder":
-                detail = change.get("detail", {})
-            else:
-                detail = change.get("detail", {})
-
-            suggestions_list.append(
-                IASuggestionItem(
-                    kind=change.get("op", "unknown"),
-                    path=f"steps[{change.get('target_step_index', -1)}]",
-                    message=change.get("reason", change.get("message", "Optimización sugerida")),
-                    confidence=change.get("confidence", 0.75),
-                    detail=detail,
-                )
-            )
-
-        return IASuggestionResponse(
-            suggestions=suggestions_list,
-            rationale=result.get("rationale", ""),
-            confidence=result.get("confidence", 0.0),
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error getting AI suggestions: {str(e)}"
+    result = await client.asuggest(payload.definition)
+
+    # Items come from the provider (possibly an LLM): validate them.
+    # detail depends on the operation type (see _DETAIL_BUILDERS).
+    suggestions_list = [
+        IASuggestionItem(
+            kind=change.get("op", "unknown"),
+            path=_step_path(change.get("target_step_index", -1)),
+            message=change.get("reason", change.get("message", "Optimización sugerida")),
+            confidence=change.get("confidence", 0.75),
+            detail=_DETAIL_BUILDERS.get(change.get("op"), _default_detail)(change),
         )
+        for change in result.get("suggested_changes", ())
+    ]
+
+    return _model_response(IASuggestionResponse(
+        suggestions=suggestions_list,
+        rationale=result.get("rationale", ""),
+        confidence=result.get("confidence", 0.0),
+    ))
+
+
+# Note classification in a single regex pass. Lookaheads anchored at the
+# start keep the original priority: timeout > salida/notification > reorden.
+_NOTE_CLASS = re.compile(
+    r"(?=.*(timeout))|(?=.*(salida|notification))|(?=.*(reorden))",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# (kind, path, detail builder) per match group; index 0 is the fallback.
+# detail is built per item so responses never share a mutable dict.
+_FIX_CHANGE_TEMPLATES = (
+    ("parameter_set", "unknown", dict),
+    ("parameter_set", "steps[*].args.timeout", lambda: {"param": "timeout", "value": 10}),
+    ("add_node", "steps[-1]", lambda: {"node": {"type": "Mock Notification"}}),
+    ("reorder_nodes", "steps", dict),
+)
 
 
 @app.post("/ia/fix", response_model=IAFixResponse, tags=["ia"])
+@ia_endpoint("Error getting AI fixes")
 async def ia_fix(
     payload: IAFixRequest,
     token: str = Depends(validate_token),
-) -> IAFixResponse:
+    client: ia_client.IAClient = Depends(get_ia),
+) -> Response:
     """
     Get AI fixes for workflow errors.
     Uses Gemini API to analyze and fix issues.
     """
-    try:
-        client = ia_client.get_ia_client()
-        result = client.fix(payload.definition, payload.logs)
-
-        changes_list = []
-        for note in result.get("notes", []):
-            if "timeout" in note.lower():
-                changes_list.append(
-                    IAFixChangeItem(
-                        kind="parameter_set",
-                        path="steps[*].args.timeout",
-                        message=note,
-                        detail={"param": "timeout", "value": 10}
-                    )
-                )
-            elif "salida" in note.lower() or "notification" in note.lower():
-                changes_list.append(
-                    IAFixChangeItem(
-                        kind="add_node",
-                        path="steps[-1]",
-                        message=note,
-                        detail={"node": {"type": "Mock Notification"}}
-                    )
-                )
-            elif "reorden" in note.lower():
-                changes_list.append(
-                    IAFixChangeItem(
-                        kind="reorder_nodes",
-                        path="steps",
-                        message=note,
-                        detail={}
-                    )
-                )
-            else:
-                changes_list.append(
-                    IAFixChangeItem(
-                        kind="parameter_set",
-                        path="unknown",
-                        message=note,
-                        detail={}
-                    )
-                )
-
-        return IAFixResponse(
-            patched_definition=result.get("patched_definition", payload.definition),
-            changes=changes_list,
-            rationale=". ".join(result.get("notes", [])) if result.get("notes") else "Fixes applied by AI.",
-            confidence=0.9,
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error getting AI fixes: {str(e)}"
+    result = await client.afix(payload.definition, payload.logs)
+
+    changes_list = []
+    for note in result.get("notes", []):
+        match = _NOTE_CLASS.match(note)
+        kind, path, build_detail = _FIX_CHANGE_TEMPLATES[match.lastindex if match else 0]
+        changes_list.append(
+            IAFixChangeItem(kind=kind, path=path, message=note, detail=build_detail())
         )
 
+    # The request definition is never mutated: fall back to it by reference
+    return _model_response(IAFixResponse(
+        patched_definition=result.get("patched_definition", payload.definition),
+        changes=changes_list,
+        rationale=". ".join(result.get("notes", [])) if result.get("notes") else "Fixes applied by AI.",
+        confidence=0.9,
+    ))
+
 
 @app.post("/ia/estimate", response_model=IAEstimateResponse, tags=["ia"])
+@ia_endpoint("Error getting AI estimation")
 async def ia_estimate(
     payload: IAEstimateRequest,
     token: str = Depends(validate_token),
-) -> IAEstimateResponse:
+    client: ia_client.IAClient = Depends(get_ia),
+) -> Response:
     """
     Get AI estimation for workflow execution.
     Uses Gemini API to estimate time and cost.
     """
-    try:
-        client = ia_client.get_ia_client()
-        result = client.estimate(payload.definition)
-        return IAEstimateResponse(
-            estimated_runtime_seconds=result.get("estimated_time_seconds", 0.0),
-            estimated_cost=result.get("estimated_cost_usd", 0.0),
-            complexity_score=result.get("complexity_score", 0.0),
-            breakdown=result.get("breakdown", []),
-            rationale=result.get("assumptions", [""])[0] if result.get("assumptions") else "",
-            confidence=result.get("confidence", 0.0),
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error getting AI estimation: {str(e)}"
-        )
+    result = await client.aestimate(payload.definition)
+
+    # Items come from the provider (possibly an LLM): validate them
+    breakdown_list = ESTIMATE_BREAKDOWN_ADAPTER.validate_python(result.get("breakdown", []))
+
+    return _model_response(IAEstimateResponse(
+        estimated_runtime_seconds=result.get("estimated_time_seconds", 0.0),
+        estimated_cost=result.get("estimated_cost_usd", 0.0),
+        complexity_score=result.get("complexity_score", 0.0),
+        breakdown=breakdown_list,
+        rationale=result.get("assumptions", [""])[0] if result.get("assumptions") else "",
+        confidence=result.get("confidence", 0.0),
+    ))
 
 
 # ============================================================================
 # Health Check
 # ============================================================================
 
+# Health payload is rebuilt at most every _HEALTH_TTL_SECONDS (polled by LBs)
+_HEALTH_TTL_SECONDS = 0.5
+_health_cache = {"body": b"", "ts": float("-inf")}
+
+
 @app.get("/health", tags=["health"])
-async def health_check():
+async def health_check() -> Response:
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now(UTC).isoformat(),
-        "database": "connected",
-        "database_path": DB_PATH
-    }
+    now = time.monotonic()
+    if now - _health_cache["ts"] > _HEALTH_TTL_SECONDS:
+        _health_cache["body"] = orjson.dumps({
+            "status": "healthy",
+            "timestamp": datetime.now(UTC).isoformat(),
+            "database": "connected",
+            "database_path": DB_PATH
+        })
+        _health_cache["ts"] = now
+    return Response(content=_health_cache["body"], media_type="application/json")
 
 
 # ============================================================================
 # FILE UPLOAD ENDPOINTS
 # ============================================================================
 
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _save_upload(src, dst: str) -> tuple[int, str]:
+    """
+    Copy an uploaded file to disk in fixed-size chunks.
+    Hashes each chunk as it is written (single pass, no re-read).
+    Returns (size, sha256 hex digest).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(dst, "wb") as f:
+        while chunk := src.read(_UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
 @app.post("/files/upload-csv", tags=["files"])
 async def upload_csv(
     file: UploadFile = File(...),
@@ -521,17 +716,16 @@ async def upload_csv(
     safe_filename = f"{file_id}_{file.filename}"
     file_path = os.path.join(upload_dir, safe_filename)
 
-    # Save file
+    # Save file (streamed in chunks, off the event loop)
     try:
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        size, sha256 = await run_in_threadpool(_save_upload, file.file, file_path)
 
         return {
             "success": True,
             "filename": safe_filename,
             "path": file_path,
-            "size": len(contents),
+            "size": size,
+            "sha256": sha256,
             "original_name": file.filename
         }
     except Exception as e:
@@ -3,8 +3,11 @@ Backend Data Models
 Integrates Frontend (Steps+Edges) with Worker (Nodes+depends_on)
 """
 
+from dataclasses import dataclass
+
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -20,6 +23,13 @@ class WorkflowTable(SQLModel, table=True):
     Uses Worker's nomenclature and format.
     """
     __tablename__ = "workflowtable"
+    __table_args__ = (
+        # Worker polling / status-filtered lists ordered by creation time
+        Index("ix_workflow_status_created", "status", "created_at"),
+        # Covers the list columns: listings scan this index instead of rows
+        # carrying the definition JSON
+        Index("ix_wf_status_cover", "status", "id", "name", "created_at"),
+    )
 
     id: str = Field(primary_key=True)
     name: str
@@ -54,7 +64,7 @@ class StepTable(SQLModel, table=True):
     __tablename__ = "steps"
 
     id: str = Field(primary_key=True)
-    workflow_id: str = Field(foreign_key="workflowtable.id")
+    workflow_id: str = Field(foreign_key="workflowtable.id", index=True)
     node_key: str  # Stable node identifier
     type: str  # Task type (http_get, validate_csv, etc.)
     params: str  # JSON serialized parameters
@@ -68,7 +78,7 @@ class EdgeTable(SQLModel, table=True):
     __tablename__ = "edges"
 
     id: str = Field(primary_key=True)
-    workflow_id: str = Field(foreign_key="workflowtable.id")
+    workflow_id: str = Field(foreign_key="workflowtable.id", index=True)
     from_node_key: str  # Source node
     to_node_key: str  # Target node
 
@@ -77,6 +87,15 @@ class EdgeTable(SQLModel, table=True):
 # PYDANTIC MODELS (API DTOs)
 # ============================================================================
 
+# Server-built response models are never mutated after construction
+# (run details are also shared across requests through the repository cache)
+RESPONSE_ITEM_CONFIG = ConfigDict(frozen=True)
+
+# Leaf items returned in bulk (task lists, logs, estimate breakdowns) are plain
+# slotted dataclasses: no per-instance __dict__ or fields-set bookkeeping
+response_leaf = dataclass(slots=True, frozen=True)
+
+
 # --- Authentication ---
 
 class LoginRequest(BaseModel):
@@ -85,11 +104,15 @@ class LoginRequest(BaseModel):
 
 
 class UserInfo(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     id: str
     name: str
 
 
 class LoginResponse(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     access_token: str
     token_type: str
     user: UserInfo
@@ -109,6 +132,8 @@ class TaskType(BaseModel):
 
 class Workflow(BaseModel):
     """Workflow entity (Frontend format)"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     id: str
     name: str
     description: str
@@ -126,6 +151,8 @@ class StepDTO(BaseModel):
 
 class StepResponse(BaseModel):
     """Step response (with id)"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     id: str
     workflow_id: str
     node_key: str
@@ -141,6 +168,8 @@ class EdgeDTO(BaseModel):
 
 class EdgeResponse(BaseModel):
     """Edge response (with id)"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     id: str
     workflow_id: str
     from_node_key: str
@@ -168,6 +197,8 @@ class UpdateWorkflowDTO(BaseModel):
 
 class WorkflowDetailDTO(BaseModel):
     """Workflow with steps and edges"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     workflow: Workflow
     steps: List[StepResponse]
     edges: List[EdgeResponse]
@@ -175,6 +206,8 @@ class WorkflowDetailDTO(BaseModel):
 
 class WorkflowListItem(BaseModel):
     """Workflow summary for list view"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     id: str
     name: str
     description: str
@@ -187,6 +220,8 @@ class WorkflowListItem(BaseModel):
 
 class Run(BaseModel):
     """Workflow execution run"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     id: str
     workflow_id: str
     state: str  # "Pending", "Running", "Succeeded", "Failed", "Canceled"
@@ -194,7 +229,8 @@ class Run(BaseModel):
     finished_at: Optional[str] = None
 
 
-class TaskInstance(BaseModel):
+@response_leaf
+class TaskInstance:
     """Individual task execution within a run"""
     id: str
     run_id: str
@@ -210,13 +246,16 @@ class TaskInstance(BaseModel):
 
 class RunDetailDTO(BaseModel):
     """Run with task instances"""
+    model_config = RESPONSE_ITEM_CONFIG
+
     run: Run
     tasks: List[TaskInstance]
 
 
 # --- Logs ---
 
-class LogEntry(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class LogEntry:
     """Log entry for run execution"""
     id: str
     run_id: str
@@ -226,6 +265,11 @@ class LogEntry(BaseModel):
     ts: str  # ISO timestamp
 
 
+# Built once: serializers for list responses of already-constructed models
+RUN_LIST_ADAPTER = TypeAdapter(List[Run])
+LOG_LIST_ADAPTER = TypeAdapter(List[LogEntry])
+
+
 class GetLogsOptions(BaseModel):
     """Options for fetching logs"""
     task: Optional[str] = None
@@ -242,6 +286,8 @@ class IASuggestionRequest(BaseModel):
 
 
 class IASuggestionItem(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     kind: str
     path: str
     message: str
@@ -250,6 +296,8 @@ class IASuggestionItem(BaseModel):
 
 
 class IASuggestionResponse(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     suggestions: List[IASuggestionItem]
     rationale: str
     confidence: float
@@ -262,6 +310,8 @@ class IAFixRequest(BaseModel):
 
 
 class IAFixChangeItem(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     kind: str
     path: str
     message: str
@@ -269,6 +319,8 @@ class IAFixChangeItem(BaseModel):
 
 
 class IAFixResponse(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     patched_definition: Dict[str, Any]
     changes: List[IAFixChangeItem]
     rationale: str
@@ -281,7 +333,8 @@ class IAEstimateRequest(BaseModel):
     goals: Optional[List[str]] = None
 
 
-class IAEstimateBreakdownItem(BaseModel):
+@response_leaf
+class IAEstimateBreakdownItem:
     step_index: int
     type: str
     time: float
@@ -289,9 +342,16 @@ class IAEstimateBreakdownItem(BaseModel):
 
 
 class IAEstimateResponse(BaseModel):
+    model_config = RESPONSE_ITEM_CONFIG
+
     estimated_runtime_seconds: float
     estimated_cost: float
     complexity_score: float
     breakdown: List[IAEstimateBreakdownItem]
     rationale: str
     confidence: float
+
+
+# Validates provider breakdown dicts into items: instances placed directly in
+# IAEstimateResponse are not revalidated by Pydantic
+ESTIMATE_BREAKDOWN_ADAPTER = TypeAdapter(List[IAEstimateBreakdownItem])
@@ -3,12 +3,19 @@ Repository Layer
 Handles all database operations for workflows, steps, edges, and runs.
 """
 
-import json
-from typing import List, Optional, Dict, Any
+import hashlib
+import os
+import re
+import sys
+import time
+import orjson
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime, UTC
 from uuid import uuid4
 from sqlmodel import Session, select, create_engine
-from sqlalchemy import Engine
+from sqlalchemy import Engine, delete, func, insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
 
 from .models import (
     WorkflowTable,
@@ -27,6 +34,7 @@ from .models import (
     Run,
     TaskInstance,
     RunDetailDTO,
+    LogEntry,
 )
 from .converters import (
     steps_and_edges_to_nodes,
@@ -36,182 +44,397 @@ from .converters import (
 )
 
 
+# Raw SQL against the Worker's run tables, built once at import
+_Q_LATEST_WORKFLOWRUN_BY_NAME = text(
+    "SELECT id, name, status, started_at, finished_at FROM workflowrun "
+    "WHERE name = :workflow_id ORDER BY id DESC LIMIT 1"
+)
+_Q_LATEST_WORKFLOWRUN_ID_BY_NAME = text(
+    "SELECT id FROM workflowrun WHERE name = :workflow_id ORDER BY id DESC LIMIT 1"
+)
+_Q_WORKFLOWRUN_BY_ID = text(
+    "SELECT id, name, status, started_at, finished_at FROM workflowrun WHERE id = :id"
+)
+_Q_NODERUN_BY_RUN = text(
+    "SELECT id, node_id, type, status, started_at, finished_at, result_data "
+    "FROM noderun WHERE workflow_id = :workflow_id ORDER BY id ASC"
+)
+# Indexes backing the queries above, created when the Worker's tables exist
+_WORKER_TABLE_INDEXES = (
+    text("CREATE INDEX IF NOT EXISTS idx_noderun_workflow_id ON noderun (workflow_id)"),
+    text("CREATE INDEX IF NOT EXISTS idx_workflowrun_name ON workflowrun (name)"),
+)
+
+
+# Worker checkout next to this repository; its models are imported lazily
+_WORKER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "Worker")
+_WORKER_RUN_MODEL = None
+
+
+def _worker_run_model():
+    """Import the Worker's WorkflowRun model once and reuse it"""
+    global _WORKER_RUN_MODEL
+    if _WORKER_RUN_MODEL is None:
+        if _WORKER_PATH not in sys.path:
+            sys.path.insert(0, _WORKER_PATH)
+        from workflow.workflow_persistence import WorkflowRun
+        _WORKER_RUN_MODEL = WorkflowRun
+    return _WORKER_RUN_MODEL
+
+
+# HTTP bodies are summarized in run logs; larger ones are only shown as text
+_JSON_PREVIEW_MAX_CHARS = 1 << 20
+_JSON_BODY_HEAD = re.compile(r"\s*[\[{]")
+
+# "run_123" or "123"; any other run reference is a workflow id
+_NUMERIC_RUN_ID = re.compile(r"(?:run_)?(\d+)")
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    """
+    Parse a Worker timestamp. SQLite stores ISO-8601 strings, which the
+    C-level fromisoformat handles (including a trailing "Z" on 3.11+);
+    dateutil is only the fallback for anything else.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        from dateutil import parser as date_parser
+        return date_parser.parse(value)
+
+
+def _dump_json(value: Any) -> str:
+    """Serialize a definition/params dict for a TEXT column (empty stays "{}")"""
+    if not value:
+        return "{}"
+    return orjson.dumps(value).decode()
+
+
+# (epoch second, ISO string) of the last timestamp formatted by _now_iso_seconds
+_now_iso_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso_seconds() -> str:
+    """Current UTC time as ISO 8601 at second resolution, formatted once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached = _now_iso_cache
+    if cached[0] != second:
+        # Swap in a new tuple so concurrent readers never see a torn pair
+        cached = _now_iso_cache = (second, datetime.fromtimestamp(second, UTC).isoformat())
+    return cached[1]
+
+
 class WorkflowRepository:
     """Repository for workflow CRUD operations"""
 
+    RUN_DETAIL_TTL_SECONDS = 1.0
+    RUN_DETAIL_CACHE_SIZE = 4096
+    WORKFLOW_CACHE_SIZE = 512
+
     def __init__(self, engine: Engine):
         self.engine = engine
+        # Session factory built once; instances skip attribute expiry on commit.
+        # When bound to a Connection that already has a transaction (tests),
+        # each session runs in a SAVEPOINT so its rollback leaves the outer
+        # transaction open; with an Engine the mode has no effect.
+        self._Session = sessionmaker(
+            self.engine,
+            class_=Session,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        # run_id -> (monotonic timestamp, RunDetailDTO)
+        self._run_detail_cache: Dict[str, Tuple[float, RunDetailDTO]] = {}
+        # workflow_id -> (updated_at, WorkflowDetailDTO), least recently used first
+        self._workflow_cache: Dict[str, Tuple[str, WorkflowDetailDTO]] = {}
+        # (ETag, serialized body) of the last workflow list built
+        self._list_cache: Tuple[str, bytes] = ("", b"")
 
     def create_schema(self):
         """Create all database tables"""
         from .models import SQLModel
         SQLModel.metadata.create_all(self.engine)
+        # create_all skips existing tables; add indexes introduced later
+        for table in (WorkflowTable, StepTable, EdgeTable):
+            for index in table.__table__.indexes:
+                index.create(self.engine, checkfirst=True)
+        # Run lookups filter the Worker's tables by these columns. The Worker
+        # owns those tables, so they may not exist yet: skip until they do.
+        for statement in _WORKER_TABLE_INDEXES:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(statement)
+            except OperationalError:
+                pass
 
     def create_workflow(self, data: CreateWorkflowDTO) -> WorkflowDetailDTO:
         """
         Create a new workflow with steps and edges.
         Converts Frontend format to Worker format and stores in shared DB.
         """
+        return self.create_workflows([data])[0]
+
+    def create_workflows(self, items: List[CreateWorkflowDTO]) -> List[WorkflowDetailDTO]:
+        """
+        Create several workflows in a single session and transaction.
+        Rows are staged as plain dicts and written with one executemany
+        INSERT per table (parents first), then committed once.
+        """
+        now = _now_iso_seconds()
+        # Full precision so list_workflows_json sees every write in its ETag
+        updated_at = datetime.now(UTC).isoformat()
+        rows: Dict[type, List[Dict[str, Any]]] = {
+            WorkflowTable: [], WorkflowMetadata: [], StepTable: [], EdgeTable: []
+        }
+        created = [self._stage_workflow(data, now, updated_at, rows) for data in items]
+
+        with self._Session() as session:
+            for table, table_rows in rows.items():
+                if table_rows:
+                    session.exec(insert(table), params=table_rows)
+            session.commit()
+
+        return created
+
+    def _stage_workflow(
+        self,
+        data: CreateWorkflowDTO,
+        now: str,
+        updated_at: str,
+        rows: Dict[type, List[Dict[str, Any]]]
+    ) -> WorkflowDetailDTO:
+        """Build the table rows for one workflow into `rows` and return its DTO"""
         workflow_id = f"wf_{uuid4().hex[:8]}"
-        now = datetime.now(UTC).replace(microsecond=0).isoformat()
 
-        with Session(self.engine) as session:
-            # Convert Frontend format (steps + edges) to Worker format (nodes with depends_on)
-            nodes = steps_and_edges_to_nodes(data.steps, data.edges)
-            definition = {"nodes": nodes}
+        # Create workflow in shared table, converting Frontend format (steps + edges)
+        # to Worker format (nodes with depends_on) straight into the serialized definition
+        rows[WorkflowTable].append(dict(
+            id=workflow_id,
+            name=data.name,
+            status="en_espera",  # Initial status for Worker polling
+            created_at=now,
+            updated_at=updated_at,
+            definition=_dump_json({"nodes": steps_and_edges_to_nodes(data.steps, data.edges)})
+        ))
+
+        # Create metadata record (Frontend-specific fields)
+        rows[WorkflowMetadata].append(dict(
+            id=workflow_id,
+            description=data.description,
+            schedule_cron=data.schedule_cron,
+            active=True
+        ))
+
+        # Create steps
+        step_responses = []
+        for step_data in data.steps:
+            step_id = f"step_{uuid4().hex[:8]}"
+            rows[StepTable].append(dict(
+                id=step_id,
+                workflow_id=workflow_id,
+                node_key=step_data.node_key,
+                type=step_data.type,
+                params=_dump_json(step_data.params)
+            ))
+            step_responses.append(StepResponse.model_construct(
+                id=step_id,
+                workflow_id=workflow_id,
+                node_key=step_data.node_key,
+                type=step_data.type,
+                params=step_data.params
+            ))
+
+        # Create edges
+        edge_responses = []
+        for edge_data in data.edges:
+            edge_id = f"edge_{uuid4().hex[:8]}"
+            rows[EdgeTable].append(dict(
+                id=edge_id,
+                workflow_id=workflow_id,
+                from_node_key=edge_data.from_node_key,
+                to_node_key=edge_data.to_node_key
+            ))
+            edge_responses.append(EdgeResponse.model_construct(
+                id=edge_id,
+                workflow_id=workflow_id,
+                from_node_key=edge_data.from_node_key,
+                to_node_key=edge_data.to_node_key
+            ))
 
-            # Create workflow in shared table (Worker format)
-            workflow_record = WorkflowTable(
+        # Return complete workflow with steps and edges
+        return WorkflowDetailDTO.model_construct(
+            workflow=Workflow.model_construct(
                 id=workflow_id,
                 name=data.name,
-                status="en_espera",  # Initial status for Worker polling
-                created_at=now,
-                updated_at=now,
-                definition=json.dumps(definition)
-            )
-            session.add(workflow_record)
-
-            # Create metadata record (Frontend-specific fields)
-            metadata = WorkflowMetadata(
-                id=workflow_id,
                 description=data.description,
                 schedule_cron=data.schedule_cron,
-                active=True
-            )
-            session.add(metadata)
-
-            # Create steps
-            step_responses = []
-            for step_data in data.steps:
-                step_id = f"step_{uuid4().hex[:8]}"
-                step = StepTable(
-                    id=step_id,
-                    workflow_id=workflow_id,
-                    node_key=step_data.node_key,
-                    type=step_data.type,
-                    params=json.dumps(step_data.params)
-                )
-                session.add(step)
-                step_responses.append(StepResponse(
-                    id=step_id,
-                    workflow_id=workflow_id,
-                    node_key=step_data.node_key,
-                    type=step_data.type,
-                    params=step_data.params
-                ))
-
-            # Create edges
-            edge_responses = []
-            for edge_data in data.edges:
-                edge_id = f"edge_{uuid4().hex[:8]}"
-                edge = EdgeTable(
-                    id=edge_id,
-                    workflow_id=workflow_id,
-                    from_node_key=edge_data.from_node_key,
-                    to_node_key=edge_data.to_node_key
-                )
-                session.add(edge)
-                edge_responses.append(EdgeResponse(
-                    id=edge_id,
-                    workflow_id=workflow_id,
-                    from_node_key=edge_data.from_node_key,
-                    to_node_key=edge_data.to_node_key
-                ))
-
-            session.commit()
-
-            # Return complete workflow with steps and edges
-            return WorkflowDetailDTO(
-                workflow=Workflow(
-                    id=workflow_id,
-                    name=data.name,
-                    description=data.description,
-                    schedule_cron=data.schedule_cron,
-                    active=True,
-                    created_at=now
-                ),
-                steps=step_responses,
-                edges=edge_responses
-            )
+                active=True,
+                created_at=now
+            ),
+            steps=step_responses,
+            edges=edge_responses
+        )
 
     def get_workflow(self, workflow_id: str) -> Optional[WorkflowDetailDTO]:
-        """Get workflow by ID with steps and edges"""
-        with Session(self.engine) as session:
-            # Get workflow and metadata
-            workflow = session.get(WorkflowTable, workflow_id)
-            if not workflow:
+        """
+        Get workflow by ID with steps and edges.
+        Served from an LRU cache validated against the row's updated_at
+        (written at microsecond precision on update, so changes made by other
+        processes are seen), so an unchanged workflow costs a single-column SELECT.
+        """
+        with self._Session() as session:
+            updated_at = session.exec(
+                select(WorkflowTable.updated_at).where(WorkflowTable.id == workflow_id)
+            ).first()
+            if updated_at is None:
+                self._workflow_cache.pop(workflow_id, None)
                 return None
 
-            metadata = session.get(WorkflowMetadata, workflow_id)
-            if not metadata:
-                # Create default metadata if missing
-                metadata = WorkflowMetadata(
-                    id=workflow_id,
-                    description="",
-                    schedule_cron=None,
-                    active=True
-                )
+            cached = self._workflow_cache.pop(workflow_id, None)
+            if cached is not None and cached[0] == updated_at:
+                # Re-insert to mark as most recently used
+                self._workflow_cache[workflow_id] = cached
+                return cached[1]
+
+            detail = self._load_workflow(session, workflow_id)
+            if detail is not None:
+                self._cache_workflow(workflow_id, updated_at, detail)
+            return detail
+
+    def _cache_workflow(self, workflow_id: str, updated_at: str, detail: WorkflowDetailDTO) -> None:
+        """Store a workflow DTO as the most recently used cache entry"""
+        self._workflow_cache[workflow_id] = (updated_at, detail)
+        if len(self._workflow_cache) > self.WORKFLOW_CACHE_SIZE:
+            # Drop the least recently used entry (dicts keep insertion order)
+            del self._workflow_cache[next(iter(self._workflow_cache))]
+
+    def _load_workflow(self, session: Session, workflow_id: str) -> Optional[WorkflowDetailDTO]:
+        """Assemble the workflow DTO from its workflow, metadata, step and edge rows"""
+        # Workflow and metadata in one query (outer join); the definition is not loaded
+        row = session.exec(
+            select(
+                WorkflowTable.name,
+                WorkflowTable.created_at,
+                WorkflowMetadata.id,
+                WorkflowMetadata.description,
+                WorkflowMetadata.schedule_cron,
+                WorkflowMetadata.active,
+            )
+            .outerjoin(WorkflowMetadata, WorkflowMetadata.id == WorkflowTable.id)
+            .where(WorkflowTable.id == workflow_id)
+        ).first()
+        if row is None:
+            return None
 
-            # Get steps
-            step_records = session.exec(
-                select(StepTable).where(StepTable.workflow_id == workflow_id)
-            ).all()
-            steps = [
-                StepResponse(
-                    id=s.id,
-                    workflow_id=s.workflow_id,
-                    node_key=s.node_key,
-                    type=s.type,
-                    params=json.loads(s.params)
-                )
-                for s in step_records
-            ]
-
-            # Get edges
-            edge_records = session.exec(
-                select(EdgeTable).where(EdgeTable.workflow_id == workflow_id)
-            ).all()
-            edges = [
-                EdgeResponse(
-                    id=e.id,
-                    workflow_id=e.workflow_id,
-                    from_node_key=e.from_node_key,
-                    to_node_key=e.to_node_key
-                )
-                for e in edge_records
-            ]
-
-            return WorkflowDetailDTO(
-                workflow=Workflow(
-                    id=workflow.id,
-                    name=workflow.name,
-                    description=metadata.description,
-                    schedule_cron=metadata.schedule_cron,
-                    active=metadata.active,
-                    created_at=workflow.created_at
-                ),
-                steps=steps,
-                edges=edges
+        name, created_at, md_id, description, schedule_cron, active = row
+        # Default metadata values if the record is missing
+        has_metadata = md_id is not None
+        return self._assemble_workflow(session, Workflow.model_construct(
+            id=workflow_id,
+            name=name,
+            description=description if has_metadata else "",
+            schedule_cron=schedule_cron if has_metadata else None,
+            active=active if has_metadata else True,
+            created_at=created_at
+        ))
+
+    @staticmethod
+    def _assemble_workflow(session: Session, workflow: Workflow) -> WorkflowDetailDTO:
+        """Attach the workflow's steps and edges to its summary"""
+        workflow_id = workflow.id
+
+        # Get steps (rows are consumed from the cursor, not materialized first)
+        step_records = session.exec(
+            select(StepTable)
+            .where(StepTable.workflow_id == workflow_id)
+            .execution_options(yield_per=256)
+        )
+        steps = [
+            StepResponse.model_construct(
+                id=s.id,
+                workflow_id=s.workflow_id,
+                node_key=s.node_key,
+                type=s.type,
+                params=orjson.loads(s.params)
+            )
+            for s in step_records
+        ]
+
+        # Get edges
+        edge_records = session.exec(
+            select(EdgeTable)
+            .where(EdgeTable.workflow_id == workflow_id)
+            .execution_options(yield_per=256)
+        )
+        edges = [
+            EdgeResponse.model_construct(
+                id=e.id,
+                workflow_id=e.workflow_id,
+                from_node_key=e.from_node_key,
+                to_node_key=e.to_node_key
             )
+            for e in edge_records
+        ]
+
+        return WorkflowDetailDTO.model_construct(workflow=workflow, steps=steps, edges=edges)
 
     def list_workflows(self) -> List[WorkflowListItem]:
         """List all workflows"""
-        with Session(self.engine) as session:
-            workflows = session.exec(select(WorkflowTable)).all()
-            result = []
-
-            for wf in workflows:
-                metadata = session.get(WorkflowMetadata, wf.id)
-                result.append(WorkflowListItem(
-                    id=wf.id,
-                    name=wf.name,
-                    description=metadata.description if metadata else "",
-                    schedule_cron=metadata.schedule_cron if metadata else None,
-                    active=metadata.active if metadata else True,
-                    created_at=wf.created_at
-                ))
-
-            return result
+        return list(self.iter_workflows())
+
+    def list_workflows_json(self) -> Tuple[str, bytes]:
+        """
+        Serialized workflow list and its ETag.
+        The ETag is derived from the table state (row count and latest
+        updated_at), so writes from the Worker or other processes change it
+        too; the body is re-serialized only when that state changes.
+        """
+        with self._Session() as session:
+            count, last_updated = session.exec(
+                select(func.count(), func.max(WorkflowTable.updated_at))
+            ).one()
+        state = f"{count}:{last_updated}".encode()
+        etag = f'"{hashlib.blake2b(state, digest_size=8).hexdigest()}"'
+
+        cached = self._list_cache
+        if cached[0] != etag:
+            body = orjson.dumps([item.model_dump() for item in self.iter_workflows()])
+            cached = self._list_cache = (etag, body)
+        return cached
+
+    def iter_workflows(self) -> Iterator[WorkflowListItem]:
+        """Yield workflow list items, fetching rows from the cursor in batches"""
+        with self._Session() as session:
+            # Only the listed columns: skips loading the (large) definition JSON.
+            # Metadata comes from the same query (outer join) instead of one
+            # lookup per workflow.
+            rows = session.exec(
+                select(
+                    WorkflowTable.id,
+                    WorkflowTable.name,
+                    WorkflowTable.created_at,
+                    WorkflowMetadata.id,
+                    WorkflowMetadata.description,
+                    WorkflowMetadata.schedule_cron,
+                    WorkflowMetadata.active,
+                )
+                .outerjoin(WorkflowMetadata, WorkflowMetadata.id == WorkflowTable.id)
+                .execution_options(yield_per=512)
+            )
+
+            for wf_id, name, created_at, md_id, description, schedule_cron, active in rows:
+                has_metadata = md_id is not None
+                yield WorkflowListItem.model_construct(
+                    id=wf_id,
+                    name=name,
+                    description=description if has_metadata else "",
+                    schedule_cron=schedule_cron if has_metadata else None,
+                    active=active if has_metadata else True,
+                    created_at=created_at
+                )
 
     def update_workflow(
         self,
@@ -219,7 +442,7 @@ class WorkflowRepository:
         data: UpdateWorkflowDTO
     ) -> Optional[WorkflowDetailDTO]:
         """Update workflow and optionally its steps/edges"""
-        with Session(self.engine) as session:
+        with self._Session() as session:
             workflow = session.get(WorkflowTable, workflow_id)
             if not workflow:
                 return None
@@ -244,83 +467,116 @@ class WorkflowRepository:
             if data.active is not None:
                 metadata.active = data.active
 
-            workflow.updated_at = datetime.now(UTC).replace(microsecond=0).isoformat()
+            # Full precision: get_workflow caches by updated_at, and another
+            # process may update the same row within the same second
+            workflow.updated_at = datetime.now(UTC).isoformat()
 
             # Update steps and edges if provided
             if data.steps is not None and data.edges is not None:
-                # Delete existing steps and edges
-                session.exec(
-                    select(StepTable).where(StepTable.workflow_id == workflow_id)
-                ).all()
-                for step in session.exec(select(StepTable).where(StepTable.workflow_id == workflow_id)):
-                    session.delete(step)
-
-                for edge in session.exec(select(EdgeTable).where(EdgeTable.workflow_id == workflow_id)):
-                    session.delete(edge)
-
-                # Create new steps
-                for step_data in data.steps:
-                    step = StepTable(
+                # Delete existing steps and edges (one DELETE each)
+                self._delete_children(session, workflow_id)
+
+                # Create new steps (one executemany INSERT)
+                step_rows = [
+                    dict(
                         id=f"step_{uuid4().hex[:8]}",
                         workflow_id=workflow_id,
                         node_key=step_data.node_key,
                         type=step_data.type,
-                        params=json.dumps(step_data.params)
+                        params=_dump_json(step_data.params)
                     )
-                    session.add(step)
+                    for step_data in data.steps
+                ]
+                if step_rows:
+                    session.exec(insert(StepTable), params=step_rows)
 
-                # Create new edges
-                for edge_data in data.edges:
-                    edge = EdgeTable(
+                # Create new edges (one executemany INSERT)
+                edge_rows = [
+                    dict(
                         id=f"edge_{uuid4().hex[:8]}",
                         workflow_id=workflow_id,
                         from_node_key=edge_data.from_node_key,
                         to_node_key=edge_data.to_node_key
                     )
-                    session.add(edge)
+                    for edge_data in data.edges
+                ]
+                if edge_rows:
+                    session.exec(insert(EdgeTable), params=edge_rows)
 
                 # Update Worker definition
-                nodes = steps_and_edges_to_nodes(data.steps, data.edges)
-                workflow.definition = json.dumps({"nodes": nodes})
+                workflow.definition = _dump_json({"nodes": steps_and_edges_to_nodes(data.steps, data.edges)})
 
             session.commit()
 
-            # Return updated workflow
-            return self.get_workflow(workflow_id)
+            # Build the response from what this transaction wrote instead of
+            # re-reading it; only unchanged steps/edges need a SELECT
+            summary = Workflow.model_construct(
+                id=workflow.id,
+                name=workflow.name,
+                description=metadata.description,
+                schedule_cron=metadata.schedule_cron,
+                active=metadata.active,
+                created_at=workflow.created_at
+            )
+            if data.steps is not None and data.edges is not None:
+                detail = WorkflowDetailDTO.model_construct(
+                    workflow=summary,
+                    steps=[
+                        StepResponse.model_construct(
+                            id=row["id"],
+                            workflow_id=workflow_id,
+                            node_key=row["node_key"],
+                            type=row["type"],
+                            params=step_data.params
+                        )
+                        for row, step_data in zip(step_rows, data.steps)
+                    ],
+                    edges=[EdgeResponse.model_construct(**row) for row in edge_rows]
+                )
+            else:
+                detail = self._assemble_workflow(session, summary)
+
+            self._cache_workflow(workflow_id, workflow.updated_at, detail)
+            return detail
 
     def delete_workflow(self, workflow_id: str) -> bool:
         """Delete workflow and all related data"""
-        with Session(self.engine) as session:
-            workflow = session.get(WorkflowTable, workflow_id)
-            if not workflow:
+        with self._Session() as session:
+            # Children first, then the workflow row; one bulk DELETE per table
+            self._delete_children(session, workflow_id)
+            session.exec(
+                delete(WorkflowMetadata).where(WorkflowMetadata.id == workflow_id),
+                execution_options={"synchronize_session": False},
+            )
+            result = session.exec(
+                delete(WorkflowTable).where(WorkflowTable.id == workflow_id),
+                execution_options={"synchronize_session": False},
+            )
+            if result.rowcount == 0:
+                session.rollback()
                 return False
 
-            # Delete metadata
-            metadata = session.get(WorkflowMetadata, workflow_id)
-            if metadata:
-                session.delete(metadata)
-
-            # Delete steps
-            for step in session.exec(select(StepTable).where(StepTable.workflow_id == workflow_id)):
-                session.delete(step)
-
-            # Delete edges
-            for edge in session.exec(select(EdgeTable).where(EdgeTable.workflow_id == workflow_id)):
-                session.delete(edge)
-
-            # Delete workflow
-            session.delete(workflow)
             session.commit()
+            self._workflow_cache.pop(workflow_id, None)
 
             return True
 
+    @staticmethod
+    def _delete_children(session: Session, workflow_id: str) -> None:
+        """Bulk-delete the steps and edges of a workflow without loading them"""
+        for table in (StepTable, EdgeTable):
+            session.exec(
+                delete(table).where(table.workflow_id == workflow_id),
+                execution_options={"synchronize_session": False},
+            )
+
     def trigger_workflow(self, workflow_id: str) -> Optional[Run]:
         """
         Trigger workflow execution by setting status to 'en_espera'.
         Worker will create the run record when it picks up the workflow.
         Returns a placeholder Run object for Frontend navigation.
         """
-        with Session(self.engine) as session:
+        with self._Session() as session:
             workflow = session.get(WorkflowTable, workflow_id)
             if not workflow:
                 return None
@@ -330,10 +586,12 @@ class WorkflowRepository:
             workflow.status = "en_espera"
             workflow.updated_at = now.isoformat()
             session.commit()
+            # Polls by workflow_id must not see the previous run's cached state
+            self._run_detail_cache.pop(workflow_id, None)
 
             # Return placeholder Run object - Worker will create the real run
             # Use workflow_id as temporary run_id so Frontend can redirect
-            return Run(
+            return Run.model_construct(
                 id=workflow_id,  # Use workflow_id as placeholder
                 workflow_id=workflow_id,
                 state="Pending",
@@ -346,21 +604,16 @@ class WorkflowRepository:
         Get execution history for a workflow.
         Reads from Worker's workflowrun table.
         """
-        # Import Worker's model
         try:
-            import sys
-            import os
-            worker_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "Worker")
-            if worker_path not in sys.path:
-                sys.path.insert(0, worker_path)
-
-            from workflow.workflow_persistence import WorkflowRun
+            WorkflowRun = _worker_run_model()
 
-            with Session(self.engine) as session:
+            with self._Session() as session:
                 # Query Worker's execution records
                 runs = session.exec(
-                    select(WorkflowRun).where(WorkflowRun.name == workflow_id)
-                ).all()
+                    select(WorkflowRun)
+                    .where(WorkflowRun.name == workflow_id)
+                    .execution_options(yield_per=256)
+                )
 
                 return [
                     Run(
@@ -377,7 +630,52 @@ class WorkflowRepository:
             print(f"Warning: Could not read Worker runs: {e}")
             return []
 
+    @staticmethod
+    def _parse_run_id(run_id: str) -> Tuple[Optional[int], bool]:
+        """
+        Split a run reference into (numeric_id, is_workflow_id).
+        Accepts "run_123", "123", or a workflow id ("wf_xxx"), which stands
+        for that workflow's most recent run.
+        """
+        match = _NUMERIC_RUN_ID.fullmatch(run_id)
+        if match is None:
+            # Not a numeric ID, treat as workflow_id
+            return None, True
+        return int(match.group(1)), False
+
+    @staticmethod
+    def _fetch_noderuns(session: Session, numeric_id: int) -> list:
+        """
+        Node runs of a Worker run, in execution order.
+        Rows: (id, node_id, type, status, started_at, finished_at, result_data);
+        shared by run details and run logs.
+        """
+        return session.execute(
+            _Q_NODERUN_BY_RUN,
+            {"workflow_id": numeric_id}
+        ).fetchall()
+
     def get_run_detail(self, run_id: str) -> Optional[RunDetailDTO]:
+        """
+        Get run details, served from a short TTL cache.
+        The Frontend polls this endpoint while a run is active; within
+        RUN_DETAIL_TTL_SECONDS repeated polls skip the database.
+        """
+        now = time.monotonic()
+        cached = self._run_detail_cache.get(run_id)
+        if cached is not None and now - cached[0] <= self.RUN_DETAIL_TTL_SECONDS:
+            return cached[1]
+
+        detail = self._load_run_detail(run_id)
+        if detail is not None:
+            self._run_detail_cache.pop(run_id, None)
+            self._run_detail_cache[run_id] = (now, detail)
+            if len(self._run_detail_cache) > self.RUN_DETAIL_CACHE_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                del self._run_detail_cache[next(iter(self._run_detail_cache))]
+        return detail
+
+    def _load_run_detail(self, run_id: str) -> Optional[RunDetailDTO]:
         """
         Get run details with task instances.
         Reads from workflowrun and noderun tables.
@@ -385,31 +683,14 @@ class WorkflowRepository:
         If run_id is a workflow_id (like "wf_xxx"), returns the most recent run for that workflow,
         or a placeholder if no runs exist yet (workflow in queue).
         """
-        from sqlalchemy import text
-        from dateutil import parser as date_parser
-
         try:
-            # Try to extract numeric ID - handle both "run_123" and "123" formats
-            numeric_id = None
-            is_workflow_id = False
+            numeric_id, is_workflow_id = self._parse_run_id(run_id)
 
-            try:
-                if run_id.startswith("run_"):
-                    numeric_id = int(run_id.replace("run_", ""))
-                elif run_id.startswith("wf_"):
-                    # This is a workflow_id, need to find the most recent run
-                    is_workflow_id = True
-                else:
-                    numeric_id = int(run_id)
-            except ValueError:
-                # Not a numeric ID, treat as workflow_id
-                is_workflow_id = True
-
-            with Session(self.engine) as session:
+            with self._Session() as session:
                 if is_workflow_id:
                     # Look for the most recent run for this workflow
                     result = session.execute(
-                        text("SELECT id, name, status, started_at, finished_at FROM workflowrun WHERE name = :workflow_id ORDER BY id DESC LIMIT 1"),
+                        _Q_LATEST_WORKFLOWRUN_BY_NAME,
                         {"workflow_id": run_id}
                     ).fetchone()
 
@@ -435,7 +716,7 @@ class WorkflowRepository:
                 else:
                     # Query by numeric ID
                     result = session.execute(
-                        text("SELECT id, name, status, started_at, finished_at FROM workflowrun WHERE id = :id"),
+                        _Q_WORKFLOWRUN_BY_ID,
                         {"id": numeric_id}
                     ).fetchone()
 
@@ -452,11 +733,8 @@ class WorkflowRepository:
                         return dt  # Already a string, return as-is
                     return dt.isoformat()
 
-                # Query noderun table for tasks
-                node_results = session.execute(
-                    text("SELECT id, node_id, type, status, started_at, finished_at FROM noderun WHERE workflow_id = :workflow_id"),
-                    {"workflow_id": numeric_id}
-                ).fetchall()
+                # Query noderun table for tasks (result_data is not needed here)
+                node_results = self._fetch_noderuns(session, numeric_id)
 
                 tasks = [
                     TaskInstance(
@@ -495,29 +773,14 @@ class WorkflowRepository:
         Generate synthetic logs from noderun table data.
         Since Worker doesn't expose structured logs, we create them from execution results.
         """
-        from sqlalchemy import text
-        from .models import LogEntry
-
         try:
-            # Convert run_id to numeric ID if needed
-            numeric_id = None
-            is_workflow_id = False
-
-            try:
-                if run_id.startswith("run_"):
-                    numeric_id = int(run_id.replace("run_", ""))
-                elif run_id.startswith("wf_"):
-                    is_workflow_id = True
-                else:
-                    numeric_id = int(run_id)
-            except ValueError:
-                is_workflow_id = True
+            numeric_id, is_workflow_id = self._parse_run_id(run_id)
 
-            with Session(self.engine) as session:
+            with self._Session() as session:
                 if is_workflow_id:
                     # Find most recent run for this workflow
                     result = session.execute(
-                        text("SELECT id FROM workflowrun WHERE name = :workflow_id ORDER BY id DESC LIMIT 1"),
+                        _Q_LATEST_WORKFLOWRUN_ID_BY_NAME,
                         {"workflow_id": run_id}
                     ).fetchone()
 
@@ -528,17 +791,13 @@ class WorkflowRepository:
                     numeric_id = result[0]
 
                 # Query noderun table for execution data
-                query = text("""
-                    SELECT id, node_id, type, status, started_at, finished_at, result_data
-                    FROM noderun
-                    WHERE workflow_id = :workflow_id
-                    ORDER BY id ASC
-                """)
-
-                node_results = session.execute(query, {"workflow_id": numeric_id}).fetchall()
+                node_results = self._fetch_noderuns(session, numeric_id)
 
                 logs = []
                 log_counter = 0
+                run_id_str = str(numeric_id)
+                # Fallback timestamp for unfinished/unstarted tasks, taken once
+                now_iso = datetime.now(UTC).isoformat()
 
                 def create_log(run_id_str: str, task_key: str, timestamp_str: str, level: str, message: str) -> LogEntry:
                     """Helper to create LogEntry with all required fields"""
@@ -549,7 +808,7 @@ class WorkflowRepository:
                         run_id=run_id_str,
                         task_instance_id=task_key,
                         ts=timestamp_str,
-                        level=level.upper(),  # Frontend expects uppercase: INFO, WARNING, ERROR, DEBUG
+                        level=level,  # Frontend expects uppercase; callers pass INFO, WARNING, ERROR, DEBUG
                         message=message
                     )
 
@@ -564,7 +823,7 @@ class WorkflowRepository:
                     result_data = {}
                     if result_data_str:
                         try:
-                            result_data = json.loads(result_data_str)
+                            result_data = orjson.loads(result_data_str)
                         except:
                             pass
 
@@ -572,9 +831,8 @@ class WorkflowRepository:
                     duration_ms = 0
                     if started_at and finished_at:
                         try:
-                            from dateutil import parser as date_parser
-                            start = date_parser.parse(started_at) if isinstance(started_at, str) else started_at
-                            end = date_parser.parse(finished_at) if isinstance(finished_at, str) else finished_at
+                            start = _parse_timestamp(started_at)
+                            end = _parse_timestamp(finished_at)
                             duration_ms = int((end - start).total_seconds() * 1000)
                         except:
                             pass
@@ -585,11 +843,12 @@ class WorkflowRepository:
                     else:
                         duration_str = f"{duration_ms / 1000:.2f}s"
 
-                    run_id_str = str(numeric_id)
-                    ts = started_at if started_at else datetime.now(UTC).isoformat()
+                    ts = started_at if started_at else now_iso
+                    # Message prefix formatted once per task, not once per log line
+                    prefix = f"[{node_key}] "
 
                     # Task start log
-                    logs.append(create_log(run_id_str, node_key, ts, "info", f"[{node_key}] Starting task: {node_type}"))
+                    logs.append(create_log(run_id_str, node_key, ts, "INFO", prefix + f"Starting task: {node_type}"))
 
                     # Task-specific logs based on type
                     if node_type == "http_get" and result_data:
@@ -599,56 +858,67 @@ class WorkflowRepository:
                         body = result_data.get("body", "")
                         headers = result_data.get("headers", {})
 
-                        logs.append(create_log(run_id_str, node_key, ts, "info", f"[{node_key}] HTTP GET to {url}"))
-                        logs.append(create_log(run_id_str, node_key, ts, "info", f"[{node_key}] Response Status: {status_code}"))
+                        logs.append(create_log(run_id_str, node_key, ts, "INFO", prefix + f"HTTP GET to {url}"))
+                        logs.append(create_log(run_id_str, node_key, ts, "INFO", prefix + f"Response Status: {status_code}"))
 
                         # Log response headers
                         if headers:
                             content_type = headers.get("Content-Type", headers.get("content-type", "N/A"))
-                            logs.append(create_log(run_id_str, node_key, ts, "info", f"[{node_key}] Content-Type: {content_type}"))
+                            logs.append(create_log(run_id_str, node_key, ts, "INFO", prefix + f"Content-Type: {content_type}"))
 
                         # Log response body preview
                         if body:
-                            # Try to parse as JSON to show structured data
-                            try:
-                                import json as json_parser
-                                parsed_body = json_parser.loads(body)
-                                if isinstance(parsed_body, dict):
-                                    field_count = len(parsed_body.keys())
-                                    sample_fields = list(parsed_body.keys())[:5]
-                                    logs.append(create_log(run_id_str, node_key, ts, "info",
-                                        f"[{node_key}] Response JSON: {field_count} fields - {', '.join(sample_fields)}{'...' if field_count > 5 else ''}"))
-                                elif isinstance(parsed_body, list):
-                                    logs.append(create_log(run_id_str, node_key, ts, "info",
-                                        f"[{node_key}] Response JSON: Array with {len(parsed_body)} items"))
-                            except:
+                            # Show structured data for JSON bodies. Only bodies that
+                            # open like an object/array and fit the preview budget are
+                            # parsed; anything else goes straight to the text preview.
+                            parsed_body = None
+                            looks_like_json = (
+                                isinstance(body, str)
+                                and len(body) <= _JSON_PREVIEW_MAX_CHARS
+                                and _JSON_BODY_HEAD.match(body) is not None
+                            )
+                            if looks_like_json:
+                                try:
+                                    parsed_body = orjson.loads(body)
+                                except orjson.JSONDecodeError:
+                                    pass
+
+                            if isinstance(parsed_body, dict):
+                                field_count = len(parsed_body)
+                                sample_fields = list(parsed_body)[:5]
+                                logs.append(create_log(run_id_str, node_key, ts, "INFO",
+                                    prefix + f"Response JSON: {field_count} fields - {', '.join(sample_fields)}{'...' if field_count > 5 else ''}"))
+                            elif isinstance(parsed_body, list):
+                                logs.append(create_log(run_id_str, node_key, ts, "INFO",
+                                    prefix + f"Response JSON: Array with {len(parsed_body)} items"))
+                            else:
                                 # Not JSON or parse error, show as text preview
-                                logs.append(create_log(run_id_str, node_key, ts, "info",
-                                    f"[{node_key}] Response body: {body[:200]}{'...' if len(body) > 200 else ''}"))
+                                logs.append(create_log(run_id_str, node_key, ts, "INFO",
+                                    prefix + f"Response body: {body[:200]}{'...' if len(body) > 200 else ''}"))
 
                     elif node_type == "validate_csv" and result_data:
                         valid = result_data.get("valid", False)
                         rows = result_data.get("rows", 0)
-                        logs.append(create_log(run_id_str, node_key, ts, "info",
-                            f"[{node_key}] CSV validation: {rows} rows - {'Valid' if valid else 'Invalid'}"))
+                        logs.append(create_log(run_id_str, node_key, ts, "INFO",
+                            prefix + f"CSV validation: {rows} rows - {'Valid' if valid else 'Invalid'}"))
 
                     elif result_data:
                         # Generic result data logging
-                        logs.append(create_log(run_id_str, node_key, ts, "info",
-                            f"[{node_key}] Result: {json.dumps(result_data)[:200]}"))
+                        logs.append(create_log(run_id_str, node_key, ts, "INFO",
+                            prefix + f"Result: {orjson.dumps(result_data).decode()[:200]}"))
 
                     # Task completion log
-                    ts_end = finished_at if finished_at else datetime.now(UTC).isoformat()
+                    ts_end = finished_at if finished_at else now_iso
                     if status == "SUCCESS":
-                        logs.append(create_log(run_id_str, node_key, ts_end, "info",
-                            f"[{node_key}] Task completed successfully in {duration_str}"))
+                        logs.append(create_log(run_id_str, node_key, ts_end, "INFO",
+                            prefix + f"Task completed successfully in {duration_str}"))
                     elif status == "FAILED":
                         error_msg = result_data.get("error", "Unknown error") if result_data else "Unknown error"
-                        logs.append(create_log(run_id_str, node_key, ts_end, "error",
-                            f"[{node_key}] Task failed after {duration_str}: {error_msg}"))
+                        logs.append(create_log(run_id_str, node_key, ts_end, "ERROR",
+                            prefix + f"Task failed after {duration_str}: {error_msg}"))
                     else:
-                        logs.append(create_log(run_id_str, node_key, ts_end, "info",
-                            f"[{node_key}] Task finished with status {status} in {duration_str}"))
+                        logs.append(create_log(run_id_str, node_key, ts_end, "INFO",
+                            prefix + f"Task finished with status {status} in {duration_str}"))
 
                 return logs
 
@@ -1,20 +1,128 @@
 # tests/conftest.py
-from pathlib import Path
-import sys
+# La raíz del proyecto entra al sys.path vía `pythonpath` en pytest.ini.
+from typing import Any, Dict
+
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-
-# Añade `src/` al sys.path para permitir la importación del módulo de aplicación.
-ROOT = Path(__file__).resolve().parents[1]
-SRC = ROOT / "src"
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import create_engine
 
 # Importa la instancia de aplicación FastAPI expuesta por el módulo principal.
-from src.main import app  # noqa: E402
+from src.main import app
+from src import main
+from src.repository import WorkflowRepository
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
+def engine():
+    """Engine SQLite en memoria compartido por toda la suite; el esquema se crea una vez."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        echo=False,
+    )
+
+    # pysqlite no emite BEGIN por su cuenta antes de un SAVEPOINT: se delega
+    # el control de transacciones a SQLAlchemy para que los savepoints de las
+    # pruebas queden dentro de la transacción externa.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    WorkflowRepository(engine).create_schema()
+    return engine
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_repo(engine):
+    """La app usa un repositorio sobre el engine en memoria (no la base del Worker)."""
+    repo = WorkflowRepository(engine)
+    app.dependency_overrides[main.get_repo] = lambda: repo
+    yield repo
+    app.dependency_overrides.pop(main.get_repo, None)
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Cliente de pruebas para peticiones HTTP síncronas contra la app."""
-    return TestClient(app)
+    """Cliente de pruebas para peticiones HTTP síncronas contra la app.
+
+    Se crea una sola vez por sesión: el lifespan de la app arranca al entrar
+    al contexto y se cierra al terminar la suite.
+    """
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Backend para pruebas async (plugin de anyio)."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def async_client(anyio_backend):
+    """Cliente async sobre ASGI; una sola conexión reutilizada por las peticiones concurrentes."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+# Payload IA compartido por las pruebas de /ia/suggestion y /ia/estimate.
+VALID_BODY: Dict[str, Any] = {
+    "name": "etl-sencillo",
+    "definition": {
+        "steps": [
+            {"type": "HTTPS GET Request", "args": {"url": "https://ejemplo.com/data.csv"}},
+            {"type": "Validate CSV File", "args": {"delimiter": ",", "columns": ["a", "b"]}},
+            {"type": "Simple Transform", "args": {"op": "uppercase", "field": "a"}},
+            {"type": "Save to Database", "args": {"table": "dest_tabla"}},
+        ]
+    },
+    "goals": ["rápido", "barato"],
+}
+
+
+@pytest.fixture(scope="session")
+def ia_payload_bytes():
+    """VALID_BODY serializado una sola vez; se envía con `content=` en vez de `json=`."""
+    return orjson.dumps(VALID_BODY)
+
+
+@pytest.fixture(scope="session")
+def openapi_spec(client):
+    """Documento OpenAPI obtenido y parseado una sola vez para toda la suite."""
+    resp = client.get("/openapi.json")
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+# Workflows sembrados directamente en el repositorio para las pruebas de listado/estado.
+SEED_NAMES = ("a", "b", "w1", "w2", "stat", "job-1")
+
+
+def seed_workflows(repo):
+    """Crea los workflows de SEED_NAMES en una sola operación y devuelve nombre -> id."""
+    from src.models import CreateWorkflowDTO
+
+    created = repo.create_workflows(
+        [CreateWorkflowDTO(name=name, steps=[], edges=[]) for name in SEED_NAMES]
+    )
+    return {name: detail.workflow.id for name, detail in zip(SEED_NAMES, created)}
+
+
+@pytest.fixture(scope="module")
+def seeded_ids(app_repo):
+    """Ids de workflows sembrados una vez por módulo (sin pasar por HTTP)."""
+    ids = seed_workflows(app_repo)
+    yield ids
+    for wid in ids.values():
+        app_repo.delete_workflow(wid)
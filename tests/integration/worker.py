@@ -2,13 +2,18 @@
 import time
 import sys
 import os
+from sqlalchemy import update
 from sqlmodel import Session, select
 
 # Añadir el directorio raíz del proyecto al path para encontrar el módulo 'src'
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
-from src.main import engine, WorkflowTable # noqa: E402
+from src.main import engine # noqa: E402
+from src.models import WorkflowTable # noqa: E402
+
+# Máximo de workflows reclamados por consulta
+BATCH_SIZE = 10
 
 
 def run_worker():
@@ -17,37 +22,55 @@ def run_worker():
 
     Este worker se ejecuta en un bucle infinito, buscando workflows en estado
     'en_espera' y cambiándolos a 'en_progreso' y luego a 'completado'.
+
+    Cada iteración reclama como máximo BATCH_SIZE workflows, los más antiguos
+    primero (usa el índice (status, created_at)), en un solo UPDATE ...
+    RETURNING; solo espera cuando no hubo trabajo. En Postgres, FOR UPDATE
+    SKIP LOCKED permite varios workers sin reclamar el mismo workflow;
+    SQLite ignora la cláusula.
     """
     print("🚀 Worker iniciado. Buscando tareas...")
     while True:
         try:
             with Session(engine) as session:
-                # 1. Buscar workflows listos para ser procesados
-                statement = select(WorkflowTable).where(WorkflowTable.status == "en_espera")
-                pending_workflows = session.exec(statement).all()
+                # 1-2. Reclamar un lote de workflows listos y pasarlo a "en_progreso"
+                #      con un único UPDATE ... RETURNING (sin leer y luego escribir)
+                pending = (
+                    select(WorkflowTable.id)
+                    .where(WorkflowTable.status == "en_espera")
+                    .order_by(WorkflowTable.created_at)
+                    .limit(BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                )
+                claimed = session.exec(
+                    update(WorkflowTable)
+                    .where(WorkflowTable.id.in_(pending.scalar_subquery()))
+                    .values(status="en_progreso")
+                    .returning(WorkflowTable.id, WorkflowTable.name)
+                ).all()
+                session.commit()
 
-                if not pending_workflows:
+                if not claimed:
                     # Si no hay trabajo, esperar un poco antes de volver a consultar y mostrar un indicador
                     print("⏳", end="", flush=True)
                     time.sleep(5)
                     continue
 
-                for workflow in pending_workflows:
-                    print(f"⚙️  Procesando workflow: {workflow.id} ({workflow.name})")
-
-                    # 2. Cambiar estado a "en_progreso"
-                    workflow.status = "en_progreso"
-                    session.add(workflow)
-                    session.commit()
-                    print(f"   -> Estado cambiado a: {workflow.status}")
-
-                    # 3. Simular trabajo y completar
-                    time.sleep(3)  # Simula una tarea que toma 3 segundos
-                    workflow.status = "completado"
-                    session.add(workflow)
-                    session.commit()
-                    print() # Salto de línea para la siguiente espera
-                    print(f"   -> ✅ Estado cambiado a: {workflow.status}")
+                batch_ids = [workflow_id for workflow_id, _ in claimed]
+                for workflow_id, name in claimed:
+                    print(f"⚙️  Procesando workflow: {workflow_id} ({name})")
+                print(f"   -> Estado cambiado a: en_progreso ({len(batch_ids)} workflows)")
+
+                # 3. Simular trabajo y completar el lote con otro UPDATE
+                time.sleep(3)  # Simula una tarea que toma 3 segundos
+                session.exec(
+                    update(WorkflowTable)
+                    .where(WorkflowTable.id.in_(batch_ids))
+                    .values(status="completado")
+                )
+                session.commit()
+                print() # Salto de línea para la siguiente espera
+                print(f"   -> ✅ Estado cambiado a: completado ({len(batch_ids)} workflows)")
 
         except Exception as e:
             print(f"Error en el worker: {e}")
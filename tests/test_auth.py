@@ -1,7 +1,7 @@
 # tests/test_auth.py
 import re
 
-UUID_RE = r"^[0-9a-fA-F-]{36}$"
+UUID_RE = re.compile(r"^[0-9a-fA-F-]{36}$")
 
 
 def test_login_success(client):
@@ -20,7 +20,7 @@ def test_login_success(client):
     assert data.get("token_type") == "bearer"
 
     user = data.get("user") or {}
-    assert re.match(UUID_RE, user.get("id", ""))
+    assert UUID_RE.match(user.get("id", ""))
     assert user.get("name") == "Demo User"
 
 
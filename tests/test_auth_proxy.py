@@ -1,5 +1,5 @@
 # tests/test_auth_proxy.py
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import uuid4
 from datetime import datetime, UTC
@@ -15,8 +15,8 @@ class FakeRepo:
 
     def __init__(self) -> None:
         self.created_names: List[str] = []
-        self.items_by_id = {}
-        self.items_list: List[WorkflowItem] = []
+        # Dict ordenado por inserción: sirve a get() y list() sin una lista paralela
+        self.items_by_id: Dict[str, WorkflowItem] = {}
 
     def create(self, name: str) -> WorkflowItem:
         self.created_names.append(name)
@@ -28,14 +28,13 @@ class FakeRepo:
             created_at=datetime.now(UTC).replace(microsecond=0).isoformat(),
         )
         self.items_by_id[wid] = item
-        self.items_list.append(item)
         return item
 
     def get(self, wid: str) -> Optional[WorkflowItem]:
         return self.items_by_id.get(wid)
 
     def list(self) -> List[WorkflowItem]:
-        return list(self.items_list)
+        return list(self.items_by_id.values())
 
 
 def test_create_rejects_missing_authorization():
@@ -6,41 +6,40 @@ Los handlers no cambian; se valida compatibilidad del contrato con la nueva pers
 
 import re
 import pytest
-from sqlmodel import create_engine
-from sqlalchemy.pool import StaticPool
+from tests.conftest import seed_workflows
 
-UUID_RE = r"^[0-9a-fA-F-]{36}$"
+UUID_RE = re.compile(r"^[0-9a-fA-F-]{36}$")
 AUTH = {"Authorization": "Bearer mock-e2e"}
 
-@pytest.fixture(scope="module")
-def engine():
-    return create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=False,
-    )
-
-
-@pytest.fixture(autouse=True, scope="module")
-def swap_repo_to_sqlmodel(engine):
+@pytest.fixture(autouse=True)
+def swap_repo_to_sqlmodel(engine, monkeypatch):
     """
-    Intercambia el repositorio global _repo de la app por SQLiteWorkflowRepo
-    y reconstruye el proxy para que use el nuevo repo.
+    Sustituye la dependencia get_repo de la app por un repositorio ligado a
+    una conexión con transacción abierta. Cada sesión del repositorio corre
+    en un SAVEPOINT (join_transaction_mode="create_savepoint"), así que sus
+    commits y rollbacks no cierran esa transacción, y al terminar cada prueba
+    se hace rollback: ninguna fila pasa de una prueba a otra. monkeypatch
+    restaura el override de sesión al terminar.
     """
     from src import main
-    from src.main import SQLiteWorkflowRepo, AuthProxy
+    from src.repository import WorkflowRepository
+
+    connection = engine.connect()
+    transaction = connection.begin()
 
-    sql_repo = SQLiteWorkflowRepo(engine=engine)
-    sql_repo.create_schema()
+    sql_repo = WorkflowRepository(connection)
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_repo, lambda: sql_repo)
 
-    # Swap de dependencias globales
-    main._repo = sql_repo
-    main.proxy = AuthProxy(main._repo)
+    yield sql_repo
 
-    yield
+    transaction.rollback()
+    connection.close()
 
-    # No se requiere teardown específico: engine en memoria muere al finalizar el proceso.
+
+@pytest.fixture
+def seeded_ids(swap_repo_to_sqlmodel):
+    """Siembra en el repo intercambiado; el rollback de cada prueba los descarta."""
+    return seed_workflows(swap_repo_to_sqlmodel)
 
 
 def test_create_workflow_persists_in_sqlmodel(client):
@@ -48,14 +47,13 @@ def test_create_workflow_persists_in_sqlmodel(client):
     resp = client.post("/workflow", json=payload, headers=AUTH)
     assert resp.status_code == 201, resp.text
     data = resp.json()
-    assert re.match(UUID_RE, data.get("id", ""))
+    assert UUID_RE.match(data.get("id", ""))
     assert data.get("status") == "en_progreso"
 
 
-def test_list_then_contains_created(client):
-    # Crea dos workflows
-    w1 = client.post("/workflow", json={"name": "a", "definition": {}}, headers=AUTH).json()["id"]
-    w2 = client.post("/workflow", json={"name": "b", "definition": {}}, headers=AUTH).json()["id"]
+def test_list_then_contains_created(client, seeded_ids):
+    # Dos workflows sembrados
+    w1, w2 = seeded_ids["a"], seeded_ids["b"]
 
     # Lista y valida presencia
     resp = client.get("/workflows", headers=AUTH)
@@ -65,12 +63,59 @@ def test_list_then_contains_created(client):
     assert w1 in ids and w2 in ids
 
 
-def test_status_found_uses_sqlmodel_store(client):
-    create = client.post("/workflow", json={"name": "stat", "definition": {}}, headers=AUTH)
-    wid = create.json()["id"]
+def test_status_found_uses_sqlmodel_store(client, seeded_ids):
+    wid = seeded_ids["stat"]
 
     resp = client.get(f"/workflows/{wid}/status", headers=AUTH)
     assert resp.status_code == 200
     data = resp.json()
     assert data["id"] == wid
     assert data["status"] in ("en_progreso", "completado", "error")
+
+
+def test_workflow_cache_sees_update_from_other_repo(swap_repo_to_sqlmodel, seeded_ids):
+    """
+    Dos repositorios sobre la misma BD (como dos workers de uvicorn): la caché
+    de detalle no debe servir datos viejos aunque la actualización ocurra en
+    el mismo segundo en que se cacheó.
+    """
+    from src.models import UpdateWorkflowDTO
+    from src.repository import WorkflowRepository
+
+    wid = seeded_ids["a"]
+    other = WorkflowRepository(swap_repo_to_sqlmodel.engine)
+
+    assert swap_repo_to_sqlmodel.get_workflow(wid).workflow.name == "a"
+    other.update_workflow(wid, UpdateWorkflowDTO(name="a-renombrado"))
+    assert swap_repo_to_sqlmodel.get_workflow(wid).workflow.name == "a-renombrado"
+
+
+def test_list_etag_tracks_writes_from_other_repo(client, swap_repo_to_sqlmodel, seeded_ids):
+    """
+    El ETag del listado se calcula a partir del estado de la tabla: una
+    escritura hecha por otro repositorio (otro proceso) lo invalida.
+    """
+    from src.models import CreateWorkflowDTO
+    from src.repository import WorkflowRepository
+
+    first = client.get("/workflows", headers=AUTH)
+    etag = first.headers["ETag"]
+    assert client.get("/workflows", headers={**AUTH, "If-None-Match": etag}).status_code == 304
+
+    other = WorkflowRepository(swap_repo_to_sqlmodel.engine)
+    created = other.create_workflow(CreateWorkflowDTO(name="externo", steps=[], edges=[]))
+
+    resp = client.get("/workflows", headers={**AUTH, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert created.workflow.id in {i["id"] for i in resp.json()}
+
+
+def test_repo_rollback_keeps_outer_transaction(swap_repo_to_sqlmodel, seeded_ids):
+    """
+    Un rollback dentro del repositorio (delete de un id inexistente) solo
+    deshace su SAVEPOINT: la transacción de la prueba y lo sembrado siguen.
+    """
+    assert swap_repo_to_sqlmodel.delete_workflow("nope") is False
+    assert swap_repo_to_sqlmodel.engine.in_transaction()
+    assert swap_repo_to_sqlmodel.get_workflow(seeded_ids["a"]) is not None
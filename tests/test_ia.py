@@ -1,30 +1,32 @@
 # tests/test_ia.py
-from typing import Dict, Any
+import asyncio
+
+import pytest
+
+from tests.conftest import VALID_BODY
 
 AUTH = {"Authorization": "Bearer mock-abc"}
+JSON_AUTH = {**AUTH, "content-type": "application/json"}
+
 
-VALID_BODY: Dict[str, Any] = {
-    "name": "etl-sencillo",
-    "definition": {
-        "steps": [
-            {"type": "HTTPS GET Request", "args": {"url": "https://ejemplo.com/data.csv"}},
-            {"type": "Validate CSV File", "args": {"delimiter": ",", "columns": ["a", "b"]}},
-            {"type": "Simple Transform", "args": {"op": "uppercase", "field": "a"}},
-            {"type": "Save to Database", "args": {"table": "dest_tabla"}},
-        ]
-    },
-    "goals": ["rápido", "barato"],
-}
-
-
-def test_ia_suggestion_requires_auth(client):
-    resp = client.post("/ia/suggestion", json=VALID_BODY)
+@pytest.mark.parametrize(
+    "path,body",
+    [
+        ("/ia/suggestion", VALID_BODY),
+        ("/ia/estimate", VALID_BODY),
+        ("/ia/fix", {"name": "w", "definition": {"steps": []}}),
+    ],
+)
+@pytest.mark.anyio
+async def test_ia_requires_auth(async_client, path, body):
+    resp = await async_client.post(path, json=body)
     assert resp.status_code == 401
     assert resp.json().get("detail") in ("Unauthorized", "Missing or invalid token")
 
 
-def test_ia_suggestion_accepts_bearer_mock_and_returns_contract(client):
-    resp = client.post("/ia/suggestion", json=VALID_BODY, headers=AUTH)
+@pytest.mark.anyio
+async def test_ia_suggestion_accepts_bearer_mock_and_returns_contract(async_client, ia_payload_bytes):
+    resp = await async_client.post("/ia/suggestion", content=ia_payload_bytes, headers=JSON_AUTH)
     assert resp.status_code == 200, resp.text
     data = resp.json()
 
@@ -46,11 +48,57 @@ def test_ia_suggestion_accepts_bearer_mock_and_returns_contract(client):
             assert isinstance(s["detail"], dict)
 
 
-def test_openapi_includes_ia_suggestion_path(client):
-    resp = client.get("/openapi.json", headers=AUTH)
-    assert resp.status_code == 200, resp.text
-    spec = resp.json()
-    paths = spec.get("paths", {})
+def test_openapi_includes_ia_suggestion_path(openapi_spec):
+    paths = openapi_spec.get("paths", {})
     assert "/ia/suggestion" in paths, "Falta path OpenAPI: /ia/suggestion"
     # Debe ser POST
     assert "post" in paths["/ia/suggestion"]
+
+
+@pytest.mark.anyio
+async def test_ia_endpoints_concurrent_contract(async_client, ia_payload_bytes):
+    """Las tres rutas IA responden bien a peticiones independientes en paralelo."""
+    paths = ("/ia/suggestion", "/ia/estimate", "/ia/fix")
+    responses = await asyncio.gather(
+        *(async_client.post(path, content=ia_payload_bytes, headers=JSON_AUTH) for path in paths)
+    )
+    for path, resp in zip(paths, responses):
+        assert resp.status_code == 200, f"{path}: {resp.text}"
+        assert isinstance(resp.json(), dict)
+
+
+class _StubSuggestIA:
+    """Cliente IA falso que devuelve un único cambio sugerido con `confidence` dado."""
+
+    def __init__(self, confidence):
+        self.confidence = confidence
+
+    async def asuggest(self, definition):
+        return {"suggested_changes": [{"op": "optimize", "confidence": self.confidence, "detail": {}}]}
+
+
+@pytest.mark.anyio
+async def test_ia_suggestion_validates_provider_items(async_client, ia_payload_bytes, monkeypatch):
+    """La salida del proveedor se valida: se coerciona "0.8" y se rechaza "high"."""
+    from src import main
+
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_ia, lambda: _StubSuggestIA("0.8"))
+    resp = await async_client.post("/ia/suggestion", content=ia_payload_bytes, headers=JSON_AUTH)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["suggestions"][0]["confidence"] == 0.8
+
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_ia, lambda: _StubSuggestIA("high"))
+    resp = await async_client.post("/ia/suggestion", content=ia_payload_bytes, headers=JSON_AUTH)
+    assert resp.status_code == 500
+
+
+def test_model_response_rejects_values_outside_schema():
+    """_model_response no serializa valores que no cumplen el esquema (red de seguridad)."""
+    from pydantic_core import PydanticSerializationError
+
+    from src.main import _model_response
+    from src.models import IASuggestionItem, IASuggestionResponse
+
+    item = IASuggestionItem.model_construct(kind="k", path="p", message="m", confidence="high", detail="oops")
+    with pytest.raises(PydanticSerializationError):
+        _model_response(IASuggestionResponse(suggestions=[item], rationale="", confidence=0.5))
@@ -1,30 +1,36 @@
 # tests/test_ia_client.py
 
 import types
-import importlib
 
-def test_getter_returns_singleton_instance(monkeypatch):
+import pytest
+
+# Módulo bajo prueba, importado una sola vez
+from src import ia_client as ia_mod
+
+
+@pytest.fixture
+def fresh_ia_client(monkeypatch):
+    """Reinicia el singleton; monkeypatch restaura la instancia previa al terminar."""
+    monkeypatch.setattr(ia_mod, "_instance", None, raising=False)
+    return ia_mod
+
+
+def test_getter_returns_singleton_instance(fresh_ia_client):
     """
     El getter debe devolver siempre la MISMA instancia (patrón Singleton).
     """
-    # Cargamos el módulo bajo prueba
-    ia_mod = importlib.import_module("src.ia_client")
-
-    # Reset interno para no depender de orden de ejecución en otros tests
-    if hasattr(ia_mod, "_instance"):
-        delattr(ia_mod, "_instance")
+    ia_mod = fresh_ia_client
 
     a = ia_mod.get_ia_client()
     b = ia_mod.get_ia_client()
     assert a is b, "get_ia_client() debe implementar Singleton (misma instancia)"
 
 
-def test_suggest_contract_minimum(monkeypatch):
+def test_suggest_contract_minimum():
     """
     suggest() debe devolver un contrato estable y determinístico
     útil para el Frontend y el Worker durante el mock.
     """
-    ia_mod = importlib.import_module("src.ia_client")
     client = ia_mod.get_ia_client()
 
     definition = {"steps": [{"type": "HTTPS GET Request", "args": {"url": "https://x"}}]}
@@ -38,12 +44,11 @@ def test_suggest_contract_minimum(monkeypatch):
     assert "rationale" in out and isinstance(out["rationale"], str)
 
 
-def test_fix_contract_minimum_accepts_logs_str_or_list(monkeypatch):
+def test_fix_contract_minimum_accepts_logs_str_or_list():
     """
     fix() debe aceptar logs como str o list[str] y normalizar internamente.
     Debe devolver una definición parcheada y notas.
     """
-    ia_mod = importlib.import_module("src.ia_client")
     client = ia_mod.get_ia_client()
 
     definition = {"steps": [{"type": "Validate CSV File", "args": {"delimiter": ","}}]}
@@ -57,11 +62,10 @@ def test_fix_contract_minimum_accepts_logs_str_or_list(monkeypatch):
         assert "notes" in out and isinstance(out["notes"], list)
 
 
-def test_estimate_contract_minimum(monkeypatch):
+def test_estimate_contract_minimum():
     """
     estimate() debe devolver tiempos y costo aproximado determinísticos en el mock.
     """
-    ia_mod = importlib.import_module("src.ia_client")
     client = ia_mod.get_ia_client()
 
     definition = {
@@ -77,3 +81,81 @@ def test_estimate_contract_minimum(monkeypatch):
     assert "estimated_time_seconds" in out and isinstance(out["estimated_time_seconds"], int)
     assert "estimated_cost_usd" in out and isinstance(out["estimated_cost_usd"], (int, float))
     assert "assumptions" in out and isinstance(out["assumptions"], list)
+
+
+def test_subject_attach_and_detach_are_honored():
+    """
+    Los observadores agregados con subject.attach() reciben los eventos y
+    subject.detach() de un observador por defecto deja de notificarlo.
+    """
+    client = ia_mod.IAClient()
+    received = []
+    extra = types.SimpleNamespace(update=received.append)
+
+    client.subject.attach(extra)
+    client.subject.detach(client.log_observer)
+    client.suggest({"name": "obs", "steps": []})
+
+    assert [e.event_type for e in received] == ["suggestion"]
+    assert client.get_logs() == []
+
+
+class _CountingProvider:
+    """Proveedor no determinístico de prueba: cuenta las llamadas a suggest()."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def suggest(self, definition):
+        self.calls += 1
+        return {"suggested_changes": [], "confidence": 0.5, "rationale": str(self.calls)}
+
+
+def test_real_provider_responses_are_memoized_with_ttl(monkeypatch):
+    """
+    Las respuestas de proveedores reales se memoizan, pero solo durante
+    _CACHE_TTL_SECONDS: al vencer se vuelve a consultar al proveedor.
+    """
+    provider = _CountingProvider()
+    client = ia_mod.IAClient(provider=provider)
+    definition = {"name": "memo", "steps": []}
+
+    assert client.suggest(definition)["rationale"] == "1"
+    assert client.suggest(definition)["rationale"] == "1"
+    assert provider.calls == 1
+
+    monkeypatch.setattr(ia_mod, "_CACHE_TTL_SECONDS", -1.0)
+    client.suggest({"name": "memo2", "steps": []})  # se guarda ya vencida
+    client.suggest({"name": "memo2", "steps": []})
+    assert provider.calls == 3
+
+
+def test_mock_provider_is_not_memoized():
+    """El mock es determinístico y barato: no pasa por el caché."""
+    client = ia_mod.IAClient(provider=ia_mod.MockIAProvider())
+    client.suggest({"name": "m", "steps": []})
+    assert len(client._cache) == 0
+
+
+def test_suggestion_chain_accepts_handlers_with_original_contract():
+    """
+    Un handler externo que implementa _process(definition, suggestions) (y
+    uno que redefine handle con dos argumentos) sigue funcionando en la cadena.
+    """
+    from src.ia.handlers import OutputNodeHandler, SuggestionHandler, TimeoutHandler
+
+    class LegacyProcessHandler(SuggestionHandler):
+        def _process(self, definition, suggestions):
+            suggestions.append({"op": "legacy"})
+            return suggestions
+
+    class LegacyHandleHandler(LegacyProcessHandler):
+        def handle(self, definition, suggestions):
+            return super().handle(definition, suggestions)
+
+    chain = TimeoutHandler()
+    chain.set_next(LegacyHandleHandler()).set_next(LegacyProcessHandler()).set_next(OutputNodeHandler())
+
+    definition = {"steps": [{"type": "HTTPS GET Request", "args": {}}]}
+    ops = [s["op"] for s in chain.handle(definition, [])]
+    assert ops == ["add_arg", "legacy", "legacy", "append_step"]
@@ -1,30 +1,13 @@
 # tests/test_ia_estimate.py
-from typing import Dict, Any, List
+import pytest
 
 AUTH = {"Authorization": "Bearer mock-abc"}
+JSON_AUTH = {**AUTH, "content-type": "application/json"}
 
-VALID_BODY: Dict[str, Any] = {
-    "name": "etl-sencillo",
-    "definition": {
-        "steps": [
-            {"type": "HTTPS GET Request", "args": {"url": "https://ejemplo.com/data.csv"}},
-            {"type": "Validate CSV File", "args": {"delimiter": ",", "columns": ["a", "b"]}},
-            {"type": "Simple Transform", "args": {"op": "uppercase", "field": "a"}},
-            {"type": "Save to Database", "args": {"table": "dest_tabla"}},
-        ]
-    },
-    "goals": ["rápido", "barato"],
-}
 
-
-def test_ia_estimate_requires_auth(client):
-    resp = client.post("/ia/estimate", json=VALID_BODY)
-    assert resp.status_code == 401
-    assert resp.json().get("detail") in ("Unauthorized", "Missing or invalid token")
-
-
-def test_ia_estimate_contract_minimum(client):
-    resp = client.post("/ia/estimate", json=VALID_BODY, headers=AUTH)
+@pytest.mark.anyio
+async def test_ia_estimate_contract_minimum(async_client, ia_payload_bytes):
+    resp = await async_client.post("/ia/estimate", content=ia_payload_bytes, headers=JSON_AUTH)
     assert resp.status_code == 200, resp.text
     data = resp.json()
 
@@ -46,10 +29,37 @@ def test_ia_estimate_contract_minimum(client):
         assert isinstance(item.get("cost"), (int, float))
 
 
-def test_openapi_includes_ia_estimate_path(client):
-    resp = client.get("/openapi.json", headers=AUTH)
-    assert resp.status_code == 200, resp.text
-    spec = resp.json()
-    paths = spec.get("paths", {})
+def test_openapi_includes_ia_estimate_path(openapi_spec):
+    paths = openapi_spec.get("paths", {})
     assert "/ia/estimate" in paths, "Falta path OpenAPI: /ia/estimate"
     assert "post" in paths["/ia/estimate"]
+
+
+class _StubEstimateIA:
+    """Cliente IA falso que devuelve el breakdown dado."""
+
+    def __init__(self, breakdown):
+        self.breakdown = breakdown
+
+    async def aestimate(self, definition):
+        return {"breakdown": self.breakdown}
+
+
+@pytest.mark.anyio
+async def test_ia_estimate_breakdown_is_validated(async_client, ia_payload_bytes, monkeypatch):
+    """
+    El breakdown del proveedor se valida: un tipo vacío sigue vacío, los
+    números en texto se convierten y los valores inválidos se rechazan.
+    """
+    from src import main
+
+    item = {"step_index": 0, "type": "", "time": "1.5", "cost": 0.25}
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_ia, lambda: _StubEstimateIA([item]))
+    resp = await async_client.post("/ia/estimate", content=ia_payload_bytes, headers=JSON_AUTH)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["breakdown"] == [{"step_index": 0, "type": "", "time": 1.5, "cost": 0.25}]
+
+    bad = {**item, "time": "fast", "cost": None}
+    monkeypatch.setitem(main.app.dependency_overrides, main.get_ia, lambda: _StubEstimateIA([bad]))
+    resp = await async_client.post("/ia/estimate", content=ia_payload_bytes, headers=JSON_AUTH)
+    assert resp.status_code == 500
@@ -1,27 +1,23 @@
 # tests/test_ia_fix.py
 from typing import Dict, Any, List
 
-AUTH = {"Authorization": "Bearer mock-abc"}
-
+import pytest
 
-def _post(client, body: Dict[str, Any]):
-    return client.post("/ia/fix", json=body, headers=AUTH)
+AUTH = {"Authorization": "Bearer mock-abc"}
 
 
-def test_ia_fix_requires_auth(client):
-    body = {"name": "w", "definition": {"steps": []}}
-    resp = client.post("/ia/fix", json=body)
-    assert resp.status_code == 401
-    assert resp.json().get("detail") in ("Unauthorized", "Missing or invalid token")
+async def _post(async_client, body: Dict[str, Any]):
+    return await async_client.post("/ia/fix", json=body, headers=AUTH)
 
 
-def test_ia_fix_contract_minimum(client):
+@pytest.mark.anyio
+async def test_ia_fix_contract_minimum(async_client):
     body = {
         "name": "etl-sencillo",
         "definition": {"steps": []},
         "logs": "optional logs text",
     }
-    resp = _post(client, body)
+    resp = await _post(async_client, body)
     assert resp.status_code == 200, resp.text
     data = resp.json()
 
@@ -33,7 +29,8 @@ def test_ia_fix_contract_minimum(client):
     assert "confidence" in data and isinstance(data["confidence"], (int, float))
 
 
-def test_ia_fix_sets_timeout_if_missing(client):
+@pytest.mark.anyio
+async def test_ia_fix_sets_timeout_if_missing(async_client):
     body = {
         "name": "w",
         "definition": {
@@ -42,7 +39,7 @@ def test_ia_fix_sets_timeout_if_missing(client):
             ]
         },
     }
-    resp = _post(client, body)
+    resp = await _post(async_client, body)
     assert resp.status_code == 200, resp.text
     data = resp.json()
 
@@ -56,7 +53,8 @@ def test_ia_fix_sets_timeout_if_missing(client):
     assert "parameter_set" in kinds
 
 
-def test_ia_fix_adds_output_if_missing(client):
+@pytest.mark.anyio
+async def test_ia_fix_adds_output_if_missing(async_client):
     body = {
         "name": "w",
         "definition": {
@@ -66,7 +64,7 @@ def test_ia_fix_adds_output_if_missing(client):
             ]
         },
     }
-    resp = _post(client, body)
+    resp = await _post(async_client, body)
     assert resp.status_code == 200, resp.text
     data = resp.json()
 
@@ -79,7 +77,8 @@ def test_ia_fix_adds_output_if_missing(client):
     assert "add_node" in kinds
 
 
-def test_ia_fix_reorders_validate_before_transform(client):
+@pytest.mark.anyio
+async def test_ia_fix_reorders_validate_before_transform(async_client):
     body = {
         "name": "w",
         "definition": {
@@ -90,7 +89,7 @@ def test_ia_fix_reorders_validate_before_transform(client):
             ]
         },
     }
-    resp = _post(client, body)
+    resp = await _post(async_client, body)
     assert resp.status_code == 200, resp.text
     data = resp.json()
 
@@ -104,10 +103,19 @@ def test_ia_fix_reorders_validate_before_transform(client):
     assert "reorder_nodes" in kinds
 
 
-def test_openapi_includes_ia_fix_path(client):
-    resp = client.get("/openapi.json", headers=AUTH)
-    assert resp.status_code == 200, resp.text
-    spec = resp.json()
-    paths = spec.get("paths", {})
+def test_openapi_includes_ia_fix_path(openapi_spec):
+    paths = openapi_spec.get("paths", {})
     assert "/ia/fix" in paths, "Falta path OpenAPI: /ia/fix"
     assert "post" in paths["/ia/fix"]
+
+
+def test_fix_change_templates_build_independent_details():
+    """Cada item recibe su propio dict de detail (también los anidados)."""
+    from src.main import _FIX_CHANGE_TEMPLATES
+
+    for _, _, build_detail in _FIX_CHANGE_TEMPLATES:
+        first, second = build_detail(), build_detail()
+        assert first == second and first is not second
+        for key, value in first.items():
+            if isinstance(value, dict):
+                assert value is not second[key]
@@ -7,27 +7,11 @@ No crea archivos .db. La interfaz debe ser compatible con el repositorio en memo
 import re
 from typing import Optional
 import pytest
-from sqlmodel import create_engine
-from sqlalchemy.pool import StaticPool
 
 # Importa los tipos/contratos del módulo principal.
 from src.main import SQLiteWorkflowRepo, WorkflowItem  # noqa: E402
 
-UUID_RE = r"^[0-9a-fA-F-]{36}$"
-
-
-@pytest.fixture(scope="module")
-def engine():
-    # BD en memoria compartida entre hilos y conexiones:
-    # - "sqlite://" con StaticPool mantiene UNA conexión viva
-    # - check_same_thread=False permite acceso desde hilos del TestClient
-    eng = create_engine(
-        "sqlite://",  # <- OJO: sin '/:memory:' aquí
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=False,
-    )
-    return eng
+UUID_RE = re.compile(r"^[0-9a-fA-F-]{36}$")
 
 
 @pytest.fixture()
@@ -42,7 +26,7 @@ def repo(engine):
 
 def test_create_returns_workflow_item(repo):
     item: WorkflowItem = repo.create(name="etl-sqlmodel", definition={"steps": []})
-    assert re.match(UUID_RE, item.id)
+    assert UUID_RE.match(item.id)
     assert item.name == "etl-sqlmodel"
     assert item.status in ("en_progreso", "completado", "error")
     # Acepta formato ISO 8601 con zona UTC ("Z" o "+00:00")
@@ -1,7 +1,7 @@
 # tests/test_workflows.py
 import re
 
-UUID_RE = r"^[0-9a-fA-F-]{36}$"
+UUID_RE = re.compile(r"^[0-9a-fA-F-]{36}$")
 AUTH = {"Authorization": "Bearer mock-abc"}
 
 
@@ -16,16 +16,15 @@ def test_create_workflow_returns_201_and_en_progreso(client):
     resp = client.post("/workflow", json=payload, headers=AUTH)
     assert resp.status_code == 201, resp.text
     data = resp.json()
-    assert re.match(UUID_RE, data.get("id", ""))
+    assert UUID_RE.match(data.get("id", ""))
     assert data.get("status") == "en_progreso"
 
 
-def test_get_workflow_status_found(client):
+def test_get_workflow_status_found(client, seeded_ids):
     """
     GET /workflows/{id}/status -> 200 OK con id y estado válido.
     """
-    create = client.post("/workflow", json={"name": "job-1", "definition": {}}, headers=AUTH)
-    wid = create.json()["id"]
+    wid = seeded_ids["job-1"]
 
     resp = client.get(f"/workflows/{wid}/status", headers=AUTH)
     assert resp.status_code == 200, resp.text
@@ -43,10 +42,9 @@ def test_get_workflow_status_not_found(client):
     assert resp.json().get("detail") in ("Not Found", "Workflow not found")
 
 
-def test_list_workflows_includes_created(client):
+def test_list_workflows_includes_created(client, seeded_ids):
     """GET /workflows retorna elementos que fueron creados previamente."""
-    w1 = client.post("/workflow", json={"name": "w1", "definition": {}}, headers=AUTH).json()["id"]
-    w2 = client.post("/workflow", json={"name": "w2", "definition": {}}, headers=AUTH).json()["id"]
+    w1, w2 = seeded_ids["w1"], seeded_ids["w2"]
 
     resp = client.get("/workflows", headers=AUTH)
     assert resp.status_code == 200, resp.text
@@ -62,13 +60,10 @@ def test_list_workflows_requires_auth(client):
     assert resp.status_code == 401
 
 
-def test_openapi_contains_expected_paths(client):
+def test_openapi_contains_expected_paths(openapi_spec):
     """
     El documento OpenAPI debe exponer los paths mínimos.
     """
-    resp = client.get("/openapi.json")
-    assert resp.status_code == 200, resp.text
-    spec = resp.json()
-    paths = spec.get("paths", {})
+    paths = openapi_spec.get("paths", {})
     for p in ("/login", "/workflow", "/workflows", "/workflows/{id}/status"):
         assert p in paths, f"Falta path OpenAPI: {p}"